@@ -0,0 +1,81 @@
+"""In-process response cache for deterministic agent runs.
+
+Responses are keyed by a stable hash of the model, prompts, sampling
+settings and tool set so repeated benchmark prompts can skip the OpenRouter
+round trip.
+Only deterministic configurations (``temperature == 0``) should be cached;
+callers are responsible for enforcing that policy.
+
+Callers may opt into :func:`normalize_message` so prompts that differ only
+in case, Unicode width, spacing or trailing punctuation share an entry.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Any
+
+RESPONSE_CACHE_MAX_ENTRIES = 1024
+
+_responses: OrderedDict[str, tuple[str, dict[str, Any]]] = OrderedDict()
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_message(text: str) -> str:
+    """Fold a user message to a canonical form for cache lookups."""
+
+    folded = unicodedata.normalize("NFKC", text).casefold()
+    return _WHITESPACE_RE.sub(" ", folded).strip().rstrip("?!.").rstrip()
+
+
+def make_cache_key(
+    model: str,
+    system_prompt: str,
+    temperature: float,
+    top_p: float,
+    user_message: str,
+    web_tool_enabled: bool = False,
+) -> str:
+    """Return a stable digest identifying a single-turn request.
+
+    The web tool is part of the key: an agent without it answers differently
+    (e.g. "I can't browse") even when no tool call ends up being made.
+    """
+
+    payload = json.dumps(
+        [model, system_prompt, temperature, top_p, user_message, web_tool_enabled],
+        ensure_ascii=False,
+    )
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def get_cached_response(key: str) -> tuple[str, dict[str, Any]] | None:
+    """Return the cached ``(text, usage)`` pair for ``key`` if present."""
+
+    entry = _responses.get(key)
+    if entry is None:
+        return None
+    _responses.move_to_end(key)
+    text, usage = entry
+    # Hand out a copy so callers cannot mutate the cached usage payload.
+    return text, dict(usage)
+
+
+def store_response(key: str, text: str, usage: dict[str, Any]) -> None:
+    """Cache a response, evicting the least recently used entry when full."""
+
+    _responses[key] = (text, dict(usage))
+    _responses.move_to_end(key)
+    while len(_responses) > RESPONSE_CACHE_MAX_ENTRIES:
+        _responses.popitem(last=False)
+
+
+def clear_response_cache() -> None:
+    """Drop every cached response."""
+
+    _responses.clear()
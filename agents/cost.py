@@ -1,6 +1,8 @@
 """Cost calculation utilities for AI model API calls."""
 
-from typing import Union
+from typing import Iterable, Union
+
+import numpy as np
 
 
 # Cost per 1K tokens (approximate rates as of 2024)
@@ -36,6 +38,27 @@ MODEL_COSTS = {
 }
 
 
+def _build_cost_table() -> dict[str, tuple[float, float]]:
+    """Flatten MODEL_COSTS into per-token rates keyed by full and bare model names."""
+    table: dict[str, tuple[float, float]] = {}
+    for name, costs in MODEL_COSTS.items():
+        rates = (costs["input_per_1k"] / 1000.0, costs["output_per_1k"] / 1000.0)
+        table[name] = rates
+        # Also register the bare name so provider-prefixed ids resolve directly
+        table.setdefault(name.rsplit("/", 1)[-1], rates)
+    return table
+
+
+# Per-token (input, output) rates, precomputed once at import
+_COST_TABLE = _build_cost_table()
+_DEFAULT_RATES = _COST_TABLE["gpt-3.5-turbo"]
+
+# Row index of each cost-table key in COST_RATES, for vectorised pricing
+MODEL_INDEX: dict[str, int] = {name: i for i, name in enumerate(_COST_TABLE)}
+# Per-token (input, output) rates as an (n_models, 2) array aligned with MODEL_INDEX
+COST_RATES = np.array(list(_COST_TABLE.values()), dtype=np.float64)
+
+
 def calculate_cost(
     input_tokens: Union[int, float],
     output_tokens: Union[int, float],
@@ -58,23 +81,11 @@ def calculate_cost(
     if input_tokens < 0 or output_tokens < 0:
         raise ValueError("Token counts cannot be negative")
 
-    if not isinstance(input_tokens, (int, float)) or not isinstance(output_tokens, (int, float)):
-        raise ValueError("Token counts must be numeric")
-
-    # Normalize model name (remove provider prefix if present)
-    normalized_model = model.split("/")[-1] if "/" in model else model
-
-    if normalized_model not in MODEL_COSTS:
-        # Default to GPT-3.5-turbo pricing for unknown models
-        normalized_model = "gpt-3.5-turbo"
-
-    costs = MODEL_COSTS[normalized_model]
-
-    # Calculate cost per 1K tokens, then convert to actual token count
-    input_cost = (input_tokens / 1000) * costs["input_per_1k"]
-    output_cost = (output_tokens / 1000) * costs["output_per_1k"]
+    # Exact id first, then the bare name without provider prefix; unknown
+    # models default to GPT-3.5-turbo pricing
+    rates = _COST_TABLE.get(model) or _COST_TABLE.get(model.rsplit("/", 1)[-1]) or _DEFAULT_RATES
 
-    total_cost = input_cost + output_cost
+    total_cost = input_tokens * rates[0] + output_tokens * rates[1]
 
     return round(total_cost, 6)  # Round to microcents precision
 
@@ -100,4 +111,81 @@ def estimate_tokens(text: str) -> int:
         return 0
 
     # Rough approximation: 1 token per 4 characters
-    return max(1, len(text) // 4)
\ No newline at end of file
+    return (len(text) >> 2) or 1
+
+
+def estimate_tokens_batch(texts: Iterable[str]) -> list[int]:
+    """
+    Estimate token counts for many strings in one pass.
+
+    Uses the same heuristic as :func:`estimate_tokens` but avoids a Python
+    function call per string, which dominates when backfilling thousands of
+    transcripts.
+
+    Args:
+        texts: Input text strings
+
+    Returns:
+        Estimated token count for each string, in input order
+    """
+    return [(len(text) >> 2) or (1 if text else 0) for text in texts]
+
+
+def encode_models(models: Iterable[str]) -> np.ndarray:
+    """
+    Map model ids to row indices of :data:`COST_RATES`.
+
+    Resolution matches :func:`calculate_cost`: exact id, then the bare name
+    without provider prefix, then GPT-3.5-turbo pricing for unknown models.
+
+    Args:
+        models: Model identifiers, one per record
+
+    Returns:
+        Integer array of rate-table indices, in input order
+    """
+    default = MODEL_INDEX["gpt-3.5-turbo"]
+    resolved: dict[str, int] = {}
+    codes = []
+    for model in models:
+        code = resolved.get(model)
+        if code is None:
+            code = MODEL_INDEX.get(model)
+            if code is None:
+                code = MODEL_INDEX.get(model.rsplit("/", 1)[-1], default)
+            resolved[model] = code
+        codes.append(code)
+    return np.array(codes, dtype=np.intp)
+
+
+def bulk_calculate_cost(
+    prompt: np.ndarray,
+    completion: np.ndarray,
+    model_codes: np.ndarray,
+    rates: np.ndarray = COST_RATES,
+) -> np.ndarray:
+    """
+    Calculate costs for many records in one vectorised pass.
+
+    Intended for backfilling ``RunRecord.cost_usd`` over historical runs:
+    convert the records to arrays once, price them here, then write back.
+
+    Args:
+        prompt: Input token counts
+        completion: Output token counts
+        model_codes: Rate-table row per record (see :func:`encode_models`)
+        rates: Per-token (input, output) rates, shape ``(n_models, 2)``
+
+    Returns:
+        Cost in USD per record, rounded to microcents
+
+    Raises:
+        ValueError: If any token count is negative
+    """
+    prompt = np.asarray(prompt, dtype=np.float64)
+    completion = np.asarray(completion, dtype=np.float64)
+    if (prompt < 0).any() or (completion < 0).any():
+        raise ValueError("Token counts cannot be negative")
+
+    selected = rates[model_codes]
+    return np.round(prompt * selected[:, 0] + completion * selected[:, 1], 6)
@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
@@ -21,6 +21,16 @@ class AgentConfig(BaseModel):
     tools: list[str] = Field(default_factory=list)
     extras: dict[str, Any] = Field(default_factory=dict)
 
+    @property
+    def web_tool_enabled(self) -> bool:
+        """Whether the web fetch tool is enabled for this agent.
+
+        Deliberately not cached: ``model_copy(update=...)`` carries a cached
+        value over to the copy even when ``tools`` changes, and the list holds
+        at most a handful of names.
+        """
+        return "web_fetch" in self.tools
+
 
 class RunRecord(BaseModel):
     """Telemetry record capturing a single model run and its outcomes."""
@@ -66,7 +76,7 @@ if __name__ == "__main__":
     )
 
     sample_run = RunRecord(
-        ts=datetime.utcnow(),
+        ts=datetime.now(timezone.utc),
         agent_name=sample_config.name,
         model=sample_config.model,
         latency_ms=1200,
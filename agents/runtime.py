@@ -3,15 +3,26 @@
 from __future__ import annotations
 
 import asyncio
+import atexit
+import io
+import operator
 import os
+from collections import OrderedDict
 from dataclasses import dataclass, asdict
 from threading import Event
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, AsyncIterator, Callable, Dict, Tuple
+import weakref
 
 from loguru import logger
 from openai import OpenAI
 from pydantic_ai import Agent
 
+from agents.cache import (
+    get_cached_response,
+    make_cache_key,
+    normalize_message,
+    store_response,
+)
 from agents.models import AgentConfig
 from agents.tools import add_numbers, utc_now
 
@@ -24,6 +35,90 @@ except ImportError:  # pragma: no cover - fallback when web tool absent
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
 
 
+class StreamCancelEvent(Event):
+    """A :class:`threading.Event` that also wakes the stream awaiting it.
+
+    UI stop handlers run on worker threads, where setting an
+    :class:`asyncio.Event` directly is not thread-safe. Setting this event
+    schedules the paired :attr:`async_event` on the loop it was created on,
+    so :func:`run_agent_stream` can race it against the next chunk. Create
+    it from a coroutine running on the streaming loop.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._loop = asyncio.get_running_loop()
+        self.async_event = asyncio.Event()
+
+    def set(self) -> None:
+        super().set()
+        try:
+            self._loop.call_soon_threadsafe(self.async_event.set)
+        except RuntimeError:  # loop already closed; nothing left to wake
+            pass
+
+
+# Cancellation primitives accepted by :func:`run_agent_stream`.
+CancelToken = Event | asyncio.Event
+
+# Agents known to stream only through ``run_stream`` ("ctx"), learned on their
+# first streaming call. pydantic-ai agents are unhashable dataclasses, so they
+# are keyed by ``id()`` and a finalizer drops the entry when the agent is freed.
+_STREAM_KIND: dict[int, str] = {}
+
+
+def _remember_stream_kind(agent: Any, kind: str) -> None:
+    """Record how ``agent`` streams for as long as the agent is alive."""
+
+    key = id(agent)
+    if key not in _STREAM_KIND:
+        try:
+            weakref.finalize(agent, _STREAM_KIND.pop, key, None)
+        except TypeError:  # not weak-referenceable; its id could be reused
+            return
+    _STREAM_KIND[key] = kind
+
+
+# OpenAI clients shared by agent builds, least recently used first; bounded so
+# a rotating OPENROUTER_API_KEY doesn't keep a connection pool open per value.
+# The bound is above _AGENT_CACHE_SIZE, so agents get_agent still holds never
+# lose their client to eviction.
+_OPENAI_CLIENT_CACHE_SIZE = 8
+_OPENAI_CLIENTS: OrderedDict[tuple[str, str], OpenAI] = OrderedDict()
+
+
+def _get_openai_client(base_url: str, api_key: str) -> OpenAI:
+    """Return a shared OpenAI client so repeated builds reuse pooled connections."""
+
+    key = (base_url, api_key)
+    client = _OPENAI_CLIENTS.get(key)
+    if client is not None:
+        _OPENAI_CLIENTS.move_to_end(key)
+        return client
+
+    client = OpenAI(base_url=base_url, api_key=api_key)
+    _OPENAI_CLIENTS[key] = client
+    if len(_OPENAI_CLIENTS) > _OPENAI_CLIENT_CACHE_SIZE:
+        _, evicted = _OPENAI_CLIENTS.popitem(last=False)
+        try:
+            evicted.close()
+        except Exception:  # pragma: no cover - best-effort cleanup
+            pass
+    return client
+
+
+@atexit.register
+def _close_openai_clients() -> None:
+    """Close cached clients at interpreter exit to avoid connection leak warnings."""
+
+    for client in _OPENAI_CLIENTS.values():
+        try:
+            client.close()
+        except Exception:  # pragma: no cover - best-effort shutdown
+            pass
+    _OPENAI_CLIENTS.clear()
+
+
 def build_agent(cfg: AgentConfig, include_web: bool = False) -> Agent:
     """Build a configured pydantic-ai Agent targeting OpenRouter.
 
@@ -49,17 +144,14 @@ def build_agent(cfg: AgentConfig, include_web: bool = False) -> Agent:
     if api_key is None:
         raise ValueError("OPENROUTER_API_KEY not set in environment")
 
-    logger.info(
-        "Building agent",
-        extra={
-            "model": cfg.model,
-            "temperature": cfg.temperature,
-            "top_p": cfg.top_p,
-            "include_web": include_web,
-        }
-    )
+    logger.bind(
+        model=cfg.model,
+        temperature=cfg.temperature,
+        top_p=cfg.top_p,
+        include_web=include_web,
+    ).info("Building agent")
 
-    client = OpenAI(base_url=OPENROUTER_BASE_URL, api_key=api_key)
+    client = _get_openai_client(OPENROUTER_BASE_URL, api_key)
 
     agent = Agent(
         cfg.model,
@@ -85,7 +177,82 @@ def build_agent(cfg: AgentConfig, include_web: bool = False) -> Agent:
     return agent
 
 
-@dataclass
+# Agents returned by get_agent, least recently used first; bounded so that
+# repeatedly edited configurations don't accumulate.
+_AGENT_CACHE_SIZE = 4
+_AGENTS: OrderedDict[tuple[str, str, str, float, float, bool], Agent] = OrderedDict()
+
+
+def get_agent(cfg: AgentConfig, include_web: bool = False) -> Agent:
+    """Return the agent for ``cfg``, reusing one built from an equivalent configuration.
+
+    Agents are stateless between runs, so configurations that agree on every
+    field :func:`build_agent` uses (model, system prompt, sampling settings,
+    tools and API key) map to the same instance. Fields the agent never sees,
+    such as the display name or UI extras, don't force a rebuild. Build
+    failures are not cached.
+    """
+
+    key = (
+        os.getenv("OPENROUTER_API_KEY") or "",
+        cfg.model,
+        cfg.system_prompt,
+        cfg.temperature,
+        cfg.top_p,
+        include_web,
+    )
+    agent = _AGENTS.get(key)
+    if agent is not None:
+        _AGENTS.move_to_end(key)
+        return agent
+
+    agent = build_agent(cfg, include_web=include_web)
+    _AGENTS[key] = agent
+    if len(_AGENTS) > _AGENT_CACHE_SIZE:
+        _AGENTS.popitem(last=False)
+    return agent
+
+
+class _DeltaCoalescer:
+    """Buffer stream deltas and forward them to a callback in batches."""
+
+    def __init__(
+        self,
+        on_delta: Callable[[str], None],
+        loop: asyncio.AbstractEventLoop,
+        window_s: float,
+        max_chars: int,
+    ) -> None:
+        self._on_delta = on_delta
+        self._loop = loop
+        self._window_s = window_s
+        self._max_chars = max_chars
+        self._parts: list[str] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+
+    def __call__(self, delta: str) -> None:
+        self._parts.append(delta)
+        self._size += len(delta)
+        if self._size >= self._max_chars:
+            self.flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self._window_s, self.flush)
+
+    def flush(self) -> None:
+        """Forward any buffered text now and cancel the pending timer."""
+
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._parts:
+            text = "".join(self._parts)
+            self._parts.clear()
+            self._size = 0
+            self._on_delta(text)
+
+
+@dataclass(slots=True)
 class StreamResult:
     """Aggregate information returned by :func:`run_agent_stream`."""
 
@@ -95,7 +262,46 @@ class StreamResult:
     aborted: bool = False
 
 
-async def run_agent(agent: Agent, user_message: str) -> Tuple[str, Dict[str, Any]]:
+def _usage_to_dict(raw_usage: Any) -> dict[str, Any] | None:
+    """Convert a provider usage object (dict, pydantic model or dataclass) to a plain dict."""
+
+    if raw_usage is None:
+        return None
+    if type(raw_usage) is dict:
+        return dict(raw_usage)
+    if hasattr(raw_usage, "model_dump"):
+        return raw_usage.model_dump()
+    if hasattr(raw_usage, "dict"):
+        return raw_usage.dict()
+    try:
+        return asdict(raw_usage)
+    except TypeError:
+        return dict(raw_usage) if isinstance(raw_usage, dict) else None
+
+
+def _result_used_tools(result: Any) -> bool:
+    """Return ``True`` when an agent result includes tool calls (or is opaque)."""
+
+    new_messages = getattr(result, "new_messages", None)
+    if not callable(new_messages):
+        # Without a message history there is no way to rule out tool calls.
+        return True
+    try:
+        for message in new_messages():
+            for part in getattr(message, "parts", ()):
+                if getattr(part, "part_kind", None) == "tool-call":
+                    return True
+    except Exception:
+        # Unknown result shapes are treated as tool-using so they are never cached.
+        return True
+    return False
+
+
+async def run_agent(
+    agent: Agent,
+    user_message: str,
+    cfg: AgentConfig | None = None,
+) -> Tuple[str, Dict[str, Any]]:
     """Execute a single-turn prompt against the provided agent.
 
     Parameters
@@ -104,6 +310,12 @@ async def run_agent(agent: Agent, user_message: str) -> Tuple[str, Dict[str, Any
         The configured agent instance to run.
     user_message: str
         The user's message to send to the agent.
+    cfg: AgentConfig | None
+        Configuration the agent was built from. When supplied with
+        ``temperature == 0`` the response is served from, and stored in, the
+        in-process response cache. Setting ``extras["normalize_cache_key"]``
+        keys the cache on :func:`agents.cache.normalize_message` so trivially
+        reworded prompts share an entry.
 
     Returns
     -------
@@ -116,40 +328,97 @@ async def run_agent(agent: Agent, user_message: str) -> Tuple[str, Dict[str, Any
         If the agent execution fails for any reason.
     """
 
-    logger.info(
-        "Starting agent execution",
-        extra={
-            "message_length": len(user_message),
-            "agent_model": getattr(agent, 'model', 'unknown'),
-        }
-    )
+    cache_key: str | None = None
+    if cfg is not None and cfg.temperature == 0:
+        cache_message = user_message
+        if cfg.extras.get("normalize_cache_key"):
+            cache_message = normalize_message(user_message)
+        cache_key = make_cache_key(
+            cfg.model, cfg.system_prompt, cfg.temperature, cfg.top_p, cache_message,
+            cfg.web_tool_enabled,
+        )
+        cached = get_cached_response(cache_key)
+        if cached is not None:
+            logger.info("Agent response served from cache")
+            return cached
+
+    logger.bind(
+        message_length=len(user_message),
+        agent_model=getattr(agent, 'model', 'unknown'),
+    ).info("Starting agent execution")
 
     try:
         result = await agent.run(user_message)
-        logger.info(
-            "Agent execution completed successfully",
-            extra={
-                "response_length": len(result.data),
-            }
+        logger.bind(response_length=len(result.data)).info(
+            "Agent execution completed successfully"
         )
     except Exception as exc:  # pragma: no cover - runtime guard
-        logger.error(
-            "Agent execution failed",
-            extra={
-                "error": str(exc),
-            }
-        )
+        logger.bind(error=str(exc)).error("Agent execution failed")
         raise RuntimeError(f"Agent execution failed: {exc}") from exc
 
-    return result.data, {}
+    usage: Dict[str, Any] = {}
+    if cache_key is not None and not _result_used_tools(result):
+        store_response(cache_key, result.data, usage)
+
+    return result.data, usage
+
+
+async def _iter_until_cancelled(
+    stream: Any,
+    cancel_token: CancelToken,
+    on_cancel: Callable[[], None],
+) -> AsyncIterator[Any]:
+    """Yield items from ``stream`` until ``cancel_token`` is set.
+
+    An :class:`asyncio.Event` is raced against each pending item so
+    cancellation lands immediately, even while the stream is waiting on the
+    network; the underlying iterator is closed to release the connection.
+    A :class:`StreamCancelEvent` is raced through its paired asyncio event;
+    a plain :class:`threading.Event` cannot be awaited and is checked before
+    each item instead. ``on_cancel`` runs once when the stream is cut short.
+    """
+
+    if isinstance(cancel_token, StreamCancelEvent):
+        cancel_token = cancel_token.async_event
+    if not isinstance(cancel_token, asyncio.Event):
+        async for item in stream:
+            if cancel_token.is_set():
+                on_cancel()
+                return
+            yield item
+        return
+
+    iterator = stream.__aiter__()
+    cancel_wait = asyncio.ensure_future(cancel_token.wait())
+    try:
+        while True:
+            next_item = asyncio.ensure_future(iterator.__anext__())
+            await asyncio.wait({next_item, cancel_wait}, return_when=asyncio.FIRST_COMPLETED)
+            if cancel_token.is_set():
+                next_item.cancel()
+                await asyncio.gather(next_item, return_exceptions=True)
+                if hasattr(iterator, "aclose"):
+                    await iterator.aclose()
+                on_cancel()
+                return
+            try:
+                item = next_item.result()
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        cancel_wait.cancel()
 
 
 async def run_agent_stream(
     agent: Agent,
     user_message: str,
     on_delta: Callable[[str], None],
-    cancel_token: Event,
+    cancel_token: CancelToken,
     correlation_id: str | None = None,
+    collect: bool = True,
+    coalesce_ms: float = 0.0,
+    coalesce_chars: int = 256,
 ) -> StreamResult:
     """
     Fixed streaming implementation with immediate cancellation response.
@@ -158,33 +427,51 @@ async def run_agent_stream(
     - Check cancellation before processing any chunk
     - Immediate return on cancellation without any text accumulation
     - Proper async context management for stream cleanup
+
+    ``cancel_token`` may be a :class:`threading.Event` (checked before each
+    chunk), or an :class:`asyncio.Event` or :class:`StreamCancelEvent`, which
+    is awaited alongside the stream so a cancellation interrupts a stalled
+    read immediately.
+
+    When ``collect`` is ``False`` deltas are only forwarded to ``on_delta`` and
+    the returned :class:`StreamResult` carries an empty ``text``; use this when
+    the caller already owns the transcript.
+
+    A positive ``coalesce_ms`` batches deltas before they reach ``on_delta``:
+    text is forwarded once per window, or sooner when ``coalesce_chars`` have
+    accumulated, and any remainder is flushed when the stream ends. This cuts
+    callback traffic for UI pushes at the cost of up to ``coalesce_ms`` latency.
     """
     logger_bound = logger.bind(correlation_id=correlation_id) if correlation_id else logger
 
-    logger_bound.info("Starting agent streaming", extra={
-        "message_length": len(user_message),
-        "agent_model": getattr(agent, 'model', 'unknown'),
-    })
+    logger_bound.bind(
+        message_length=len(user_message),
+        agent_model=getattr(agent, 'model', 'unknown'),
+    ).info("Starting agent streaming")
 
     loop = asyncio.get_running_loop()
     start_ts = loop.time()
-    text_parts: list[str] = []
+    text_buffer = io.StringIO()
+    response_length = 0
     usage: dict[str, Any] | None = None
     aborted = False
 
-    def _usage_to_dict(raw_usage: Any) -> dict[str, Any] | None:
-        if raw_usage is None:
-            return None
-        if isinstance(raw_usage, dict):
-            return dict(raw_usage)
-        if hasattr(raw_usage, "model_dump"):
-            return raw_usage.model_dump()
-        if hasattr(raw_usage, "dict"):
-            return raw_usage.dict()
-        try:
-            return asdict(raw_usage)
-        except TypeError:
-            return None
+    coalescer: _DeltaCoalescer | None = None
+    forward = on_delta
+    if coalesce_ms > 0:
+        coalescer = _DeltaCoalescer(on_delta, loop, coalesce_ms / 1000, coalesce_chars)
+        forward = coalescer
+
+    # Whether text is collected is fixed for the whole stream, so pick the
+    # delta sink once instead of re-testing ``collect`` on every chunk.
+    if collect:
+        write = text_buffer.write
+
+        def emit(delta: str) -> None:
+            forward(delta)
+            write(delta)
+    else:
+        emit = forward
 
     async def _consume_stream_immediate_cancel(stream_iter: Any) -> None:
         """
@@ -193,81 +480,112 @@ async def run_agent_stream(
         Checks cancel_token BEFORE processing each chunk to ensure
         no partial text accumulation on cancellation.
         """
-        nonlocal usage, aborted
-        try:
-            async for chunk in stream_iter:
-                # CRITICAL FIX: Check cancellation BEFORE processing chunk
-                if cancel_token.is_set():
-                    aborted = True
-                    logger_bound.info("Streaming cancelled before chunk processing")
-                    break
+        nonlocal usage, aborted, response_length
+
+        raw_usage: Any = None
+
+        def _on_cancel() -> None:
+            nonlocal aborted
+            aborted = True
+            logger_bound.info("Streaming cancelled before chunk processing")
 
-                delta = getattr(chunk, "delta", None)
-                if isinstance(delta, str):
-                    on_delta(delta)
-                    text_parts.append(delta)
+        # Bound once per stream; attrgetter avoids re-resolving the attribute
+        # name on every chunk of a long stream.
+        get_delta = operator.attrgetter("delta")
+        get_response = operator.attrgetter("response")
 
-                # Only update usage if we haven't been cancelled
+        try:
+            # CRITICAL FIX: cancellation is observed BEFORE processing each chunk
+            async for chunk in _iter_until_cancelled(stream_iter, cancel_token, _on_cancel):
+                try:
+                    delta = get_delta(chunk)
+                except AttributeError:
+                    delta = None
+                if type(delta) is str:
+                    emit(delta)
+                    response_length += len(delta)
+
+                # Only update usage if we haven't been cancelled. Only the
+                # latest value is kept, so convert it once after the stream
+                # rather than on every chunk.
                 if not aborted:
-                    response = getattr(chunk, "response", None)
+                    try:
+                        response = get_response(chunk)
+                    except AttributeError:
+                        response = None
                     if response is not None:
-                        usage = _usage_to_dict(getattr(response, "usage", None))
+                        raw_usage = getattr(response, "usage", None)
         except Exception as e:
-            logger_bound.error("Error during stream consumption", extra={"error": str(e)})
+            logger_bound.bind(error=str(e)).error("Error during stream consumption")
             raise
 
-    # Main streaming logic with improved error handling
+        usage = _usage_to_dict(raw_usage)
+
+    # Main streaming logic with improved error handling. Agents that were
+    # already found to lack ``run(..., stream=True)`` skip straight to
+    # ``run_stream`` instead of re-probing with a failing call.
+    stream_iterable = None
+    if _STREAM_KIND.get(id(agent)) != "ctx":
+        try:
+            stream_iterable = agent.run(user_message, stream=True)
+        except TypeError:
+            _remember_stream_kind(agent, "ctx")
+        except Exception as exc:
+            raise RuntimeError(f"Agent streaming failed: {exc}") from exc
+
     try:
-        stream_iterable = agent.run(user_message, stream=True)
-    except TypeError:
-        stream_iterable = None
-    except Exception as exc:
-        raise RuntimeError(f"Agent streaming failed: {exc}") from exc
-
-    # CRITICAL FIX: Check cancellation BEFORE starting stream consumption
-    if cancel_token.is_set():
-        aborted = True
-        logger_bound.info("Streaming cancelled before consumption started")
-    else:
-        if stream_iterable is not None:
-            if asyncio.iscoroutine(stream_iterable):
-                stream_iterable = await stream_iterable
-            await _consume_stream_immediate_cancel(stream_iterable)
+        # CRITICAL FIX: Check cancellation BEFORE starting stream consumption
+        if cancel_token.is_set():
+            aborted = True
+            logger_bound.info("Streaming cancelled before consumption started")
         else:
-            try:
-                stream_ctx = agent.run_stream(user_message)
-            except Exception as exc:
-                raise RuntimeError(f"Agent streaming failed: {exc}") from exc
-
-            async with stream_ctx as stream_response:
-                text_stream = stream_response.stream_text(delta=True)
+            if stream_iterable is not None:
+                if asyncio.iscoroutine(stream_iterable):
+                    stream_iterable = await stream_iterable
+                await _consume_stream_immediate_cancel(stream_iterable)
+            else:
                 try:
-                    async for delta_text in text_stream:
-                        # CRITICAL FIX: Check cancellation BEFORE processing delta
-                        if cancel_token.is_set():
-                            aborted = True
-                            logger_bound.info("Streaming cancelled before delta processing")
-                            break
-                        if delta_text:
-                            on_delta(delta_text)
-                            text_parts.append(delta_text)
-                finally:
-                    if hasattr(text_stream, "aclose"):
-                        await text_stream.aclose()
-
-                if not aborted and usage is None:
-                    usage = _usage_to_dict(stream_response.usage())
+                    stream_ctx = agent.run_stream(user_message)
+                except Exception as exc:
+                    raise RuntimeError(f"Agent streaming failed: {exc}") from exc
+
+                def _on_delta_cancel() -> None:
+                    nonlocal aborted
+                    aborted = True
+                    logger_bound.info("Streaming cancelled before delta processing")
+
+                async with stream_ctx as stream_response:
+                    text_stream = stream_response.stream_text(delta=True)
+                    try:
+                        # CRITICAL FIX: cancellation is observed BEFORE processing each delta
+                        async for delta_text in _iter_until_cancelled(
+                            text_stream, cancel_token, _on_delta_cancel
+                        ):
+                            if delta_text:
+                                emit(delta_text)
+                                response_length += len(delta_text)
+                    finally:
+                        if hasattr(text_stream, "aclose"):
+                            await text_stream.aclose()
+
+                    if not aborted and usage is None:
+                        # A method in older pydantic-ai releases, a property in newer ones
+                        raw_usage = stream_response.usage
+                        usage = _usage_to_dict(raw_usage() if callable(raw_usage) else raw_usage)
+    finally:
+        if coalescer is not None:
+            coalescer.flush()
 
     latency_ms = int((loop.time() - start_ts) * 1000)
 
-    logger_bound.info("Agent streaming completed", extra={
-        "response_length": len(text_parts),
-        "latency_ms": latency_ms,
-        "aborted": aborted,
-        "usage_available": usage is not None,
-    })
+    logger_bound.bind(
+        response_length=response_length,
+        latency_ms=latency_ms,
+        aborted=aborted,
+        usage_available=usage is not None,
+    ).info("Agent streaming completed")
 
-    return StreamResult("".join(text_parts), usage, latency_ms, aborted)
+    return StreamResult(text_buffer.getvalue(), usage, latency_ms, aborted)
 
 
 if __name__ == "__main__":
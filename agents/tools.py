@@ -8,18 +8,101 @@ implemented and validated before exposing them to user prompts.
 
 from __future__ import annotations
 
+import asyncio
 import unicodedata
 import re
 import math
+import time
 import httpx
 from datetime import datetime, timezone
-from urllib.parse import urlparse
+from functools import lru_cache
 from typing import Any
 
 from pydantic import BaseModel, Field
 from pydantic_ai import RunContext
 
 
+def _compile_alternation(patterns: tuple[str, ...], flags: int = 0) -> re.Pattern[str]:
+    """Fuse patterns into one regex so the text is scanned once per category."""
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns), flags)
+
+
+# Validation patterns, fused per category and compiled once at import. _XSS_RE is
+# shared by the agent name and system prompt validators.
+_XSS_RE = _compile_alternation(
+    (
+        r'<script[^>]*>.*?</script>',
+        r'<iframe[^>]*>.*?</iframe>',
+        r'<object[^>]*>.*?</object>',
+        r'<embed[^>]*>.*?</embed>',
+        r'javascript:',
+        r'data:',
+        r'<[^>]*on\w+\s*=',
+        r'expression\s*\(',
+        r'vbscript\s*:',
+        r'onload\s*=',
+        r'onerror\s*=',
+    ),
+    re.IGNORECASE,
+)
+
+_SQL_RE = _compile_alternation(
+    (
+        r';\s*drop\s+',
+        r';\s*delete\s+from\s+',
+        r';\s*update\s+.*set\s+',
+        r'union\s+select\s+',
+        r'\bexec\s*\(',
+        r'\beval\s*\(',
+    ),
+    re.IGNORECASE,
+)
+
+_INJECTION_RE = _compile_alternation(
+    (
+        r'ignore\s+all\s+previous\s+instructions',
+        r'override\s+system\s+prompt',
+        r'system\s+prompt\s+override',
+        r'you\s+are\s+no\s+longer',
+        r'forget\s+your\s+previous',
+        r'\[system\]',
+        r'\[override\]',
+    ),
+    re.IGNORECASE,
+)
+
+_CODE_RE = _compile_alternation(
+    (
+        r'exec\s*\(',
+        r'eval\s*\(',
+        r'execfile\s*\(',
+        r'__import__\s*\(',
+        r'subprocess\.',
+        r'os\.system\s*\(',
+        r'os\.popen\s*\(',
+    )
+)
+
+# Literal pre-checks: every pattern in a category requires at least one of its
+# markers, so text containing none of them can skip that category's regex.
+_XSS_MARKERS = ("<", ":", "(", "=")
+_CODE_MARKERS = ("(", "subprocess.")
+
+
+def _has_any(text: str, markers: tuple[str, ...]) -> bool:
+    """Return True if any literal marker occurs in text."""
+    return any(marker in text for marker in markers)
+
+
+_MAX_AGENT_NAME_LENGTH = 100
+
+# Used with fullmatch: no anchors, and no '$' leniency for a trailing newline
+_VALID_NAME_RE = re.compile(r'[a-zA-Z0-9\s\-_]+')
+
+# C0 control characters (code points below 32)
+_CONTROL_CHAR_RE = re.compile(r'[\x00-\x1f]')
+
+
 def validate_agent_name_comprehensive(name: str) -> dict:
     """
     Comprehensive agent name validation with Unicode and injection protection.
@@ -34,60 +117,43 @@ def validate_agent_name_comprehensive(name: str) -> dict:
     if not isinstance(name, str):
         return {"is_valid": False, "message": "Name must be a string"}
 
-    # Unicode normalization to catch homoglyph attacks
-    normalized_name = unicodedata.normalize('NFKC', name)
+    # NFKC composes at most 4 code points into one, so anything longer than
+    # 4x the limit is still too long after normalization; reject it up front
+    if len(name) > 4 * _MAX_AGENT_NAME_LENGTH:
+        return {"is_valid": False, "message": "Agent name cannot exceed 100 characters"}
+
+    # Unicode normalization to catch homoglyph attacks; ASCII is already
+    # NFKC-normal, so the common case skips the decomposition pass
+    if name.isascii():
+        normalized_name = name
+    else:
+        normalized_name = unicodedata.normalize('NFKC', name)
 
     # Length checks
     if len(normalized_name) == 0:
         return {"is_valid": False, "message": "Agent name cannot be empty"}
 
-    if len(normalized_name) > 100:
+    if len(normalized_name) > _MAX_AGENT_NAME_LENGTH:
         return {"is_valid": False, "message": "Agent name cannot exceed 100 characters"}
 
     # Reject control characters
-    if any(ord(c) < 32 for c in normalized_name):
+    if _CONTROL_CHAR_RE.search(normalized_name):
         return {"is_valid": False, "message": "Agent name cannot contain control characters"}
 
     # XSS patterns (expanded)
-    xss_patterns = [
-        r'<script[^>]*>.*?</script>',
-        r'<iframe[^>]*>.*?</iframe>',
-        r'<object[^>]*>.*?</object>',
-        r'<embed[^>]*>.*?</embed>',
-        r'javascript:',
-        r'vbscript:',
-        r'data:',
-        r'<[^>]*on\w+\s*=',
-        r'expression\s*\(',
-        r'vbscript\s*:',
-        r'onload\s*=',
-        r'onerror\s*=',
-    ]
-
-    for pattern in xss_patterns:
-        if re.search(pattern, normalized_name, re.IGNORECASE):
-            return {"is_valid": False, "message": "Agent name contains potentially unsafe content"}
+    if _XSS_RE.search(normalized_name):
+        return {"is_valid": False, "message": "Agent name contains potentially unsafe content"}
 
     # SQL injection patterns
-    sql_patterns = [
-        r';\s*drop\s+',
-        r';\s*delete\s+from\s+',
-        r';\s*update\s+.*set\s+',
-        r'union\s+select\s+',
-        r'\bexec\s*\(',
-        r'\beval\s*\(',
-    ]
-
-    for pattern in sql_patterns:
-        if re.search(pattern, normalized_name, re.IGNORECASE):
-            return {"is_valid": False, "message": "Agent name contains potentially unsafe content"}
+    if _SQL_RE.search(normalized_name):
+        return {"is_valid": False, "message": "Agent name contains potentially unsafe content"}
 
     # Path traversal patterns
     if '..' in normalized_name or '\\' in normalized_name:
         return {"is_valid": False, "message": "Agent name contains invalid path characters"}
 
     # Valid name pattern (alphanumeric, spaces, hyphens, underscores)
-    if not re.match(r'^[a-zA-Z0-9\s\-_]+$', normalized_name):
+    if not _VALID_NAME_RE.fullmatch(normalized_name):
         return {"is_valid": False, "message": "Agent name can only contain letters, numbers, spaces, hyphens, and underscores"}
 
     return {"is_valid": True, "message": "Valid agent name"}
@@ -105,59 +171,25 @@ def validate_system_prompt_comprehensive(prompt: str) -> dict:
         return {"is_valid": False, "message": "Maximum 10,000 characters allowed"}
 
     # XSS patterns (expanded)
-    xss_patterns = [
-        r'<script[^>]*>.*?</script>',
-        r'<iframe[^>]*>.*?</iframe>',
-        r'<object[^>]*>.*?</object>',
-        r'<embed[^>]*>.*?</embed>',
-        r'javascript:',
-        r'vbscript:',
-        r'data:',
-        r'<[^>]*on\w+\s*=',
-        r'expression\s*\(',
-        r'vbscript\s*:',
-        r'onload\s*=',
-        r'onerror\s*=',
-    ]
+    if _has_any(prompt, _XSS_MARKERS) and _XSS_RE.search(prompt):
+        return {"is_valid": False, "message": "System prompt contains potentially unsafe content"}
 
-    for pattern in xss_patterns:
-        if re.search(pattern, prompt, re.IGNORECASE):
-            return {"is_valid": False, "message": "System prompt contains potentially unsafe content"}
-
-    # Check for prompt injection patterns
-    injection_patterns = [
-        r'ignore\s+all\s+previous\s+instructions',
-        r'override\s+system\s+prompt',
-        r'system\s+prompt\s+override',
-        r'you\s+are\s+no\s+longer',
-        r'forget\s+your\s+previous',
-        r'\[system\]',
-        r'\[override\]',
-    ]
-
-    prompt_lower = prompt.lower()
-    for pattern in injection_patterns:
-        if re.search(pattern, prompt_lower):
-            return {"is_valid": False, "message": "System prompt contains potentially unsafe override patterns"}
+    # Check for prompt injection patterns; IGNORECASE handles casing, so no
+    # lowered copy of the prompt is needed
+    if _INJECTION_RE.search(prompt):
+        return {"is_valid": False, "message": "System prompt contains potentially unsafe override patterns"}
 
     # Check for code execution patterns
-    code_patterns = [
-        r'exec\s*\(',
-        r'eval\s*\(',
-        r'execfile\s*\(',
-        r'__import__\s*\(',
-        r'subprocess\.',
-        r'os\.system\s*\(',
-        r'os\.popen\s*\(',
-    ]
-
-    for pattern in code_patterns:
-        if re.search(pattern, prompt):
-            return {"is_valid": False, "message": "System prompt contains code execution patterns"}
+    if _has_any(prompt, _CODE_MARKERS) and _CODE_RE.search(prompt):
+        return {"is_valid": False, "message": "System prompt contains code execution patterns"}
 
     return {"is_valid": True, "message": "Valid system prompt"}
 
 
+# Allowed deviation from a whole number of micro-units (1e-6) in temperatures
+_PRECISION_TOLERANCE = 1e-6
+
+
 def validate_temperature_robust(value: Any) -> dict:
     """
     Robust temperature validation with comprehensive type checking.
@@ -191,15 +223,23 @@ def validate_temperature_robust(value: Any) -> dict:
     if numeric_value > 2.0:
         return {"is_valid": False, "message": "Temperature cannot be greater than 2.0"}
 
-    # Check for potential issues with extreme precision
-    if numeric_value != round(numeric_value, 6):
+    # Check for potential issues with extreme precision: more than six
+    # decimal places. Compared in micro-units with a tolerance far below one
+    # step, so representation noise such as 0.1 + 0.2 is not rejected.
+    scaled = numeric_value * 1_000_000
+    if abs(scaled - round(scaled)) > _PRECISION_TOLERANCE:
         return {"is_valid": False, "message": "Temperature precision is too high"}
 
     return {"is_valid": True, "message": "Valid temperature"}
 
 
 # Allow-list for secure web access to prevent SSRF attacks
-ALLOWED_DOMAINS = {"example.com", "api.github.com", "raw.githubusercontent.com"}
+ALLOWED_DOMAINS = frozenset({"example.com", "api.github.com", "raw.githubusercontent.com"})
+
+# Host of an http(s) URL. The host must end the authority (optionally followed
+# by a numeric port), so userinfo tricks such as ``https://example.com:80@evil.com``
+# never match and are refused.
+_URL_HOST_RE = re.compile(r"^https?://([^/?#@:\\\s]+)(?::\d{1,5})?(?=[/?#]|\Z)", re.IGNORECASE)
 
 
 class AddInput(BaseModel):
@@ -216,21 +256,43 @@ async def add_numbers(ctx: RunContext, input: AddInput) -> float:
     return input.a + input.b
 
 
+DEFAULT_TIME_FORMAT = "%Y-%m-%d %H:%M:%S UTC"
+
+
 class NowInput(BaseModel):
     """Input schema for getting current time with optional format string."""
 
-    fmt: str = Field(default="%Y-%m-%d %H:%M:%S UTC")
+    fmt: str = Field(default=DEFAULT_TIME_FORMAT)
+
+
+# Formatted timestamp for the most recent (whole second, format) pair, reused until
+# the clock ticks or a different format is requested.
+_last_second = -1
+_last_fmt = DEFAULT_TIME_FORMAT
+_last_timestamp = ""
 
 
 async def utc_now(ctx: RunContext, input: NowInput) -> str:
     """Get current UTC time. Use this when the user asks what time it is."""
 
+    global _last_second, _last_fmt, _last_timestamp
+
     # Using UTC avoids timezone ambiguity and leaking server locale data.
-    # Return ISO format for consistency with standards
-    if input.fmt == "%Y-%m-%d %H:%M:%S UTC":
-        return datetime.now(timezone.utc).strftime(input.fmt)
-    else:
-        return datetime.now(timezone.utc).strftime(input.fmt)
+    fmt = input.fmt
+    if "%f" in fmt:
+        # Sub-second output changes within a second, so it can never be memoised.
+        return datetime.now(timezone.utc).strftime(fmt)
+
+    second = int(time.time())
+    if second != _last_second or fmt != _last_fmt:
+        if fmt == DEFAULT_TIME_FORMAT:
+            _last_timestamp = time.strftime(fmt, time.gmtime(second))
+        else:
+            # datetime keeps %Z/%z rendering identical to the uncached path ("UTC", "+0000").
+            _last_timestamp = datetime.fromtimestamp(second, timezone.utc).strftime(fmt)
+        _last_second = second
+        _last_fmt = fmt
+    return _last_timestamp
 
 
 class FetchInput(BaseModel):
@@ -240,7 +302,7 @@ class FetchInput(BaseModel):
     timeout_s: float = Field(default=10.0, ge=1.0, le=30.0)
 
 
-ALLOWED_CONTENT_TYPES = {
+ALLOWED_CONTENT_TYPES = frozenset({
     'text/plain',
     'text/html',
     'text/xml',
@@ -249,12 +311,84 @@ ALLOWED_CONTENT_TYPES = {
     'application/rss+xml',
     'text/markdown',
     'text/x-markdown'
-}
+})
+
 
+FETCH_MAX_CHARS = 4096
+FETCH_MAX_KEEPALIVE_CONNECTIONS = 20
 
+# Shared HTTP client so repeated fetches reuse pooled connections and TLS
+# sessions. An ``AsyncClient`` is bound to the event loop it first runs on,
+# so the client is rebuilt whenever fetch_url runs under a different loop.
+_http_client: httpx.AsyncClient | None = None
+_http_client_loop: asyncio.AbstractEventLoop | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Return the shared client for the running loop, creating it lazily."""
+
+    global _http_client, _http_client_loop
+
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client.is_closed or _http_client_loop is not loop:
+        stale_client, stale_loop = _http_client, _http_client_loop
+        _http_client = httpx.AsyncClient(
+            follow_redirects=True,
+            headers={'User-Agent': 'Agent-Lab/1.0'},
+            # Charset-less bodies decode as UTF-8 rather than being sniffed.
+            default_encoding='utf-8',
+            limits=httpx.Limits(max_keepalive_connections=FETCH_MAX_KEEPALIVE_CONNECTIONS),
+        )
+        _http_client_loop = loop
+        if stale_client is not None and not stale_client.is_closed:
+            _close_stale_http_client(stale_client, stale_loop, loop)
+    return _http_client
+
+
+# Close tasks for replaced clients, held so they aren't garbage collected mid-close
+_closing_http_clients: set[asyncio.Task[None]] = set()
+
+
+def _close_stale_http_client(
+    client: httpx.AsyncClient,
+    client_loop: asyncio.AbstractEventLoop | None,
+    loop: asyncio.AbstractEventLoop,
+) -> None:
+    """Release the connection pool of a client replaced after a loop change."""
+
+    if client_loop is not None and client_loop.is_running():
+        # Its connections belong to that loop, so close it there
+        asyncio.run_coroutine_threadsafe(client.aclose(), client_loop)
+        return
+
+    async def _aclose() -> None:
+        try:
+            await client.aclose()
+        except Exception:  # its loop is gone; the sockets are dropped either way
+            pass
+
+    task = loop.create_task(_aclose())
+    _closing_http_clients.add(task)
+    task.add_done_callback(_closing_http_clients.discard)
+
+
+async def aclose_http_client() -> None:
+    """Close the shared fetch client; call from the application's shutdown hook."""
+
+    global _http_client, _http_client_loop
+
+    client, _http_client, _http_client_loop = _http_client, None, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+
+
+@lru_cache(maxsize=128)
 def is_allowed_content_type(content_type: str) -> bool:
     """
     Check if content type is allowed for text processing.
+
+    Results are memoised per raw header value; servers repeat a handful of
+    content types, so the parse is skipped after the first response.
     """
     if not content_type:
         return False
@@ -274,23 +408,21 @@ async def fetch_url(ctx: RunContext, input: FetchInput) -> str:
     Fetch URL content with encoding-aware truncation.
 
     Properly handles:
-    - Character encoding detection
+    - Character encoding (declared charset, else UTF-8; no sniffing)
     - Safe truncation at character boundaries
     - Content length limits
     """
     try:
-        parsed_url = urlparse(input.url)
-        domain = parsed_url.netloc.lower()
+        host_match = _URL_HOST_RE.match(input.url)
+        # Case-fold and drop a fully-qualified trailing dot so equivalent
+        # spellings of an allow-listed host compare equal.
+        domain = host_match.group(1).lower().rstrip(".") if host_match else ""
 
         if domain not in ALLOWED_DOMAINS:
             return f"Refused: domain '{domain}' not in allow-list."
 
-        async with httpx.AsyncClient(
-            timeout=input.timeout_s,
-            follow_redirects=True,
-            headers={'User-Agent': 'Agent-Lab/1.0'}
-        ) as client:
-            response = await client.get(input.url)
+        client = _get_http_client()
+        async with client.stream("GET", input.url, timeout=input.timeout_s) as response:
             response.raise_for_status()
 
             # Validate content type
@@ -298,20 +430,26 @@ async def fetch_url(ctx: RunContext, input: FetchInput) -> str:
             if not is_allowed_content_type(content_type):
                 return f"Error: Unsupported content type '{content_type}'"
 
-            # Detect encoding
-            detected_encoding = response.encoding or 'utf-8'
+            # Decode incrementally (using the response charset, undecodable bytes
+            # replaced) and stop reading once past the limit, so oversized bodies
+            # are never downloaded or decoded in full. Re-chunking to the limit
+            # keeps at most one chunk of text buffered beyond it.
+            parts: list[str] = []
+            size = 0
+            async for chunk in response.aiter_text(chunk_size=FETCH_MAX_CHARS):
+                parts.append(chunk)
+                size += len(chunk)
+                if size > FETCH_MAX_CHARS:
+                    break
 
-            try:
-                content = response.text
-            except UnicodeDecodeError:
-                return "Error: Failed to decode response as text."
+        content = "".join(parts)
 
-            # Apply size limits
-            if len(content) > 4096:
-                content = content[:4096]
-                content += "\n\n[Content truncated to 4096 characters]"
+        # Apply size limits
+        if len(content) > FETCH_MAX_CHARS:
+            content = content[:FETCH_MAX_CHARS]
+            content += f"\n\n[Content truncated to {FETCH_MAX_CHARS} characters]"
 
-            return content
+        return content
 
     except httpx.TimeoutException:
         return "Error: Request timed out."
@@ -322,7 +460,6 @@ async def fetch_url(ctx: RunContext, input: FetchInput) -> str:
 
 
 if __name__ == "__main__":  # pragma: no cover
-    import asyncio
     from unittest.mock import Mock
 
     async def test_tools() -> None:
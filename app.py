@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import asyncio
 import sys
+from contextlib import asynccontextmanager
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
 from datetime import datetime, timezone
+from functools import lru_cache, wraps
 from os import getenv
 from pathlib import Path
 from threading import Event
-from typing import Any, AsyncGenerator, Literal, cast
+from typing import Any, AsyncGenerator, AsyncIterator, Callable, Literal, cast
 from uuid import uuid4
 
 ROOT_DIR = Path(__file__).resolve().parent
@@ -22,9 +25,10 @@ from loguru import logger
 from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
 
 from agents.models import AgentConfig, RunRecord, Session
-from agents.runtime import build_agent, run_agent_stream
-from services.persist import append_run, init_csv, list_sessions, save_session, load_session
-from services.catalog import get_model_choices, get_models
+from agents.runtime import StreamCancelEvent, get_agent, run_agent_stream
+from agents.tools import aclose_http_client
+from services.persist import append_runs, init_csv, list_sessions, save_session, load_session
+from services.catalog import FALLBACK_MODELS, get_models
 from uuid import uuid4
 from datetime import datetime, timezone
 from pathlib import Path
@@ -111,6 +115,15 @@ def health_check() -> dict[str, Any]:
     }
 
 
+def _catalog_source_label(source_enum: str, timestamp: datetime) -> str:
+    """Describe where the model catalog came from for the UI."""
+
+    if source_enum == "dynamic":
+        # Catalog timestamps are created timezone-aware in UTC, so no conversion is needed
+        return f"Dynamic (fetched {timestamp.strftime('%H:%M')})"
+    return "Fallback"
+
+
 def load_initial_models() -> tuple[
     list[tuple[str, str]],
     str,
@@ -121,10 +134,12 @@ def load_initial_models() -> tuple[
 
     try:
         models, source_enum, timestamp = get_models()
-    except Exception:  # pragma: no cover - defensive guard
+    except Exception:
         # Security: avoid leaking internal errors to the UI or console logs.
+        # Use the bundled catalog directly; retrying get_models() would repeat
+        # the lookup that just failed.
         logger.warning("Failed to load models, using fallback catalog.")
-        models, source_enum, timestamp = get_models()
+        models, source_enum, timestamp = list(FALLBACK_MODELS), "fallback", datetime.now(timezone.utc)
 
     # Create display labels: "Display Name (provider)" -> model_id
     display_choices = []
@@ -132,11 +147,7 @@ def load_initial_models() -> tuple[
         display_label = f"{model.display_name} ({model.provider})"
         display_choices.append((display_label, model.id))
 
-    if source_enum == "dynamic":
-        fetch_time = timestamp.astimezone(timezone.utc).strftime("%H:%M")
-        source_label = f"Dynamic (fetched {fetch_time})"
-    else:
-        source_label = "Fallback"
+    source_label = _catalog_source_label(source_enum, timestamp)
 
     logger.info(
         "Model catalog loaded",
@@ -150,17 +161,52 @@ def load_initial_models() -> tuple[
     return display_choices, source_label, models, source_enum
 
 
-INITIAL_MODEL_CHOICES, INITIAL_MODEL_SOURCE_LABEL, _INITIAL_MODELS, INITIAL_MODEL_SOURCE_ENUM = (
-    load_initial_models()
-)
+@lru_cache(maxsize=1)
+def _initial_model_catalog() -> tuple[
+    list[tuple[str, str]],
+    str,
+    list[Any],
+    Literal["dynamic", "fallback"],
+]:
+    """Load the starting catalog on first use rather than when the module is imported."""
 
-DEFAULT_MODEL_ID = (
-    INITIAL_MODEL_CHOICES[0][1]
-    if INITIAL_MODEL_CHOICES
-    else "openai/gpt-4-turbo"
-)
+    return load_initial_models()
 
-INITIAL_DROPDOWN_VALUES = [choice[0] for choice in INITIAL_MODEL_CHOICES]
+
+def _fallback_catalog() -> tuple[
+    list[tuple[str, str]],
+    str,
+    list[Any],
+    Literal["dynamic", "fallback"],
+]:
+    """Return the bundled catalog in the same shape as load_initial_models."""
+
+    models = list(FALLBACK_MODELS)
+    choices = [(f"{model.display_name} ({model.provider})", model.id) for model in models]
+    return choices, "Fallback", models, "fallback"
+
+
+# How long create_ui waits for the startup catalog before rendering the bundled
+# fallback and hydrating the dropdown on page load instead
+INITIAL_CATALOG_WAIT_S = 0.1
+
+_initial_catalog_future: Future | None = None
+
+
+def prefetch_initial_models() -> Future:
+    """Start loading the startup catalog in a background thread, once."""
+
+    global _initial_catalog_future
+    if _initial_catalog_future is None:
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="catalog-prefetch")
+        _initial_catalog_future = executor.submit(_initial_model_catalog)
+        # The submitted load still runs; the worker thread exits once it is done
+        executor.shutdown(wait=False)
+    return _initial_catalog_future
+
+
+# Static default; the UI selects the first catalog model once the catalog is loaded
+DEFAULT_MODEL_ID = FALLBACK_MODELS[0].id if FALLBACK_MODELS else "openai/gpt-4-turbo"
 
 load_dotenv()
 
@@ -185,25 +231,59 @@ DEFAULT_AGENT_CONFIG = AgentConfig(
 )
 
 
+@lru_cache(maxsize=256)
 def _format_source_display(label: str) -> str:
-    """Render the model source label for display."""
+    """Render the model source label for display.
+
+    Labels are "Fallback" or carry an HH:MM fetch time, so the set is small
+    and repeats across refreshes.
+    """
 
     return f"**Model catalog:** {label}"
 
 
+_WEB_BADGE_ON = (
+    "<span style=\"background:#0066cc;color:white;padding:4px 8px;border-radius:4px;\">"
+    "Web Tool: ON</span>"
+)
+_WEB_BADGE_OFF = (
+    "<span style=\"background:#666666;color:white;padding:4px 8px;border-radius:4px;\">"
+    "Web Tool: OFF</span>"
+)
+
+
 def _web_badge_html(enabled: bool) -> str:
     """Render the HTML badge describing the web tool state."""
 
-    badge_color = "#0066cc" if enabled else "#666666"
-    badge_state = "ON" if enabled else "OFF"
-    return (
-        "<span style=\"background:{color};color:white;padding:4px 8px;border-radius:4px;\">"
-        "Web Tool: {state}</span>"
-    ).format(color=badge_color, state=badge_state)
+    return _WEB_BADGE_ON if enabled else _WEB_BADGE_OFF
 
 
 # UX Improvements - Inline Validation, Keyboard Shortcuts, Loading States
 
+def _memoize_field_validator(validator: Callable[[Any], dict]) -> Callable[[Any], dict]:
+    """Cache a pure single-field validator on its input value.
+
+    Callers get a shallow copy of the cached result so they can't corrupt the
+    cache; unhashable inputs are validated uncached.
+    """
+
+    @lru_cache(maxsize=256, typed=True)
+    def cached(value: Any) -> dict:
+        return validator(value)
+
+    @wraps(validator)
+    def wrapper(value: Any) -> dict:
+        try:
+            hash(value)
+        except TypeError:
+            return validator(value)
+        return cached(value).copy()
+
+    wrapper.cache_clear = cached.cache_clear  # type: ignore[attr-defined]
+    return wrapper
+
+
+@_memoize_field_validator
 def validate_agent_name(name: str) -> dict:
     """Validate agent name field with security checks."""
     from agents.tools import validate_agent_name_comprehensive
@@ -219,6 +299,7 @@ def validate_agent_name(name: str) -> dict:
         return {"status": "error", "message": "❌ Agent Name: Maximum 100 characters allowed", "is_valid": False}
     return {"status": "success", "message": "✅ Agent Name is valid", "is_valid": True}
 
+@_memoize_field_validator
 def validate_system_prompt(prompt: str) -> dict:
     """Validate system prompt field with security checks."""
     from agents.tools import validate_system_prompt_comprehensive
@@ -234,6 +315,7 @@ def validate_system_prompt(prompt: str) -> dict:
         return {"status": "error", "message": "❌ System Prompt: Maximum 10,000 characters allowed", "is_valid": False}
     return {"status": "success", "message": "✅ System Prompt is valid", "is_valid": True}
 
+@_memoize_field_validator
 def validate_temperature(temp: str | float) -> dict:
     """Validate temperature field with robust validation."""
     from agents.tools import validate_temperature_robust
@@ -244,6 +326,7 @@ def validate_temperature(temp: str | float) -> dict:
 
     return {"status": "success", "message": "✅ Temperature is valid", "is_valid": True}
 
+@_memoize_field_validator
 def validate_top_p(top_p: str | float) -> dict:
     """Validate top_p field."""
     try:
@@ -260,65 +343,65 @@ def validate_model_selection(model_id: str, available_models: list | None) -> di
     """Validate model selection."""
     if not available_models:
         return {"status": "error", "message": "❌ Model: No models available", "is_valid": False}
-    model_ids = [m.id for m in available_models]
-    if model_id not in model_ids:
+    # Stop at the first match instead of building an id list on every call
+    if not any(m.id == model_id for m in available_models):
         return {"status": "error", "message": "❌ Model: Please select a valid model", "is_valid": False}
     return {"status": "success", "message": "✅ Model is valid", "is_valid": True}
 
+# Single-value validators by form field; the model field also needs the catalog
+_FIELD_VALIDATORS: dict[str, Callable[[Any], dict]] = {
+    "agent_name": validate_agent_name,
+    "system_prompt": validate_system_prompt,
+    "temperature": validate_temperature,
+    "top_p": validate_top_p,
+}
+
 def validate_form_field(field_name: str, value: Any, available_models: list | None = None) -> dict:
     """Central validation dispatcher."""
-    if field_name == "agent_name":
-        return validate_agent_name(value)
-    elif field_name == "system_prompt":
-        return validate_system_prompt(value)
-    elif field_name == "temperature":
-        return validate_temperature(value)
-    elif field_name == "top_p":
-        return validate_top_p(value)
-    elif field_name == "model":
+    validator = _FIELD_VALIDATORS.get(field_name)
+    if validator is not None:
+        return validator(value)
+    if field_name == "model":
         return validate_model_selection(value, available_models)
     return {"status": "unknown", "message": "", "is_valid": True}
 
 # Keyboard Shortcuts Implementation
+# Shortcut actions by key; Ctrl/Cmd and Alt shortcuts use disjoint keys
+_MODIFIER_SHORTCUTS = {
+    'enter': 'send_message',
+    'k': 'focus_input',
+    'r': 'refresh_models',
+    's': 'save_session',
+    'l': 'load_session',
+}
+# Accessibility shortcuts
+_ALT_SHORTCUTS = {
+    '1': 'focus_chat_tab',
+    '2': 'focus_config_tab',
+    '3': 'focus_sessions_tab',
+    '4': 'focus_analytics_tab',
+    '5': 'focus_model_comparison_tab',
+}
+
 def handle_keyboard_shortcut(keyboard_event: gr.EventData) -> str:
     """Handle keyboard shortcuts from JavaScript with accessibility enhancements."""
     try:
         event_data = keyboard_event._data if hasattr(keyboard_event, '_data') else {}
         key = event_data.get('key', '').lower()
-        ctrl_key = event_data.get('ctrlKey', False)
-        meta_key = event_data.get('metaKey', False)
-        shift_key = event_data.get('shiftKey', False)
-        alt_key = event_data.get('altKey', False)
 
-        # Normalize Ctrl/Cmd
-        modifier = ctrl_key or meta_key
-
-        # Define shortcuts with accessibility considerations
-        if modifier and key == 'enter':
-            return 'send_message'
-        elif modifier and key == 'k':
-            return 'focus_input'
-        elif modifier and key == 'r':
-            return 'refresh_models'
-        elif key == 'escape':
+        if key == 'escape':
             return 'stop_generation'
-        # Accessibility shortcuts
-        elif alt_key and key == '1':
-            return 'focus_chat_tab'
-        elif alt_key and key == '2':
-            return 'focus_config_tab'
-        elif alt_key and key == '3':
-            return 'focus_sessions_tab'
-        elif alt_key and key == '4':
-            return 'focus_analytics_tab'
-        elif alt_key and key == '5':
-            return 'focus_model_comparison_tab'
-        elif modifier and shift_key and key == 'h':
-            return 'show_help'
-        elif modifier and key == 's':
-            return 'save_session'
-        elif modifier and key == 'l':
-            return 'load_session'
+
+        # Normalize Ctrl/Cmd
+        if event_data.get('ctrlKey', False) or event_data.get('metaKey', False):
+            action = _MODIFIER_SHORTCUTS.get(key)
+            if action is not None:
+                return action
+            if key == 'h' and event_data.get('shiftKey', False):
+                return 'show_help'
+
+        if event_data.get('altKey', False):
+            return _ALT_SHORTCUTS.get(key, 'none')
 
         return 'none'
     except Exception:
@@ -435,21 +518,19 @@ def build_agent_handler(
         tools=["web_fetch"] if web_enabled else [],
     )
 
-    badge_html = _web_badge_html(web_enabled)
-
     try:
-        agent = build_agent(updated_config, include_web=web_enabled)
+        agent = get_agent(updated_config, include_web=web_enabled)
         AGENT_BUILD_COUNT.labels(success='true').inc()
         status_message = "✅ Agent built successfully"
         announcement = announce_status_change("Agent built successfully", "polite")
     except Exception as exc:  # pragma: no cover - runtime guard
         AGENT_BUILD_COUNT.labels(success='false').inc()
-        error_badge = _web_badge_html("web_fetch" in config_state.tools)
+        error_badge = _web_badge_html(config_state.web_tool_enabled)
         status_message = f"❌ Error: {exc}"
         announcement = announce_status_change(f"Failed to build agent: {str(exc)}", "assertive")
         return config_state, status_message, error_badge, None, announcement
 
-    return updated_config, status_message, badge_html, agent, announcement
+    return updated_config, status_message, _web_badge_html(web_enabled), agent, announcement
 
 
 def refresh_models_handler(
@@ -474,22 +555,66 @@ def refresh_models_handler(
             (f"{model.display_name} ({model.provider})", model.id)
             for model in models
         ]
-        if source_enum == "dynamic":
-            fetch_time = timestamp.astimezone(timezone.utc).strftime("%H:%M")
-            source_label = f"Dynamic (fetched {fetch_time})"
-        else:
-            source_label = "Fallback"
+        source_label = _catalog_source_label(source_enum, timestamp)
         message = f"✅ Model catalog refreshed: {len(choices)} options from {source_enum}."
     except Exception:  # pragma: no cover - defensive guard
         # Security: revert to fallback data without exposing sensitive error details.
         logger.warning("Model refresh failed; falling back to cached list.")
-        choices = list(existing_choices or INITIAL_MODEL_CHOICES)
+        choices = list(existing_choices or _initial_model_catalog()[0])
         if not choices:
             choices = [(DEFAULT_MODEL_ID, DEFAULT_MODEL_ID)]
         source_label = "Fallback"
         source_enum = "fallback"
         message = "⚠️ Model refresh failed. Using fallback model list."
 
+    return _catalog_ui_updates(
+        choices, source_label, source_enum, message, current_display_label, config_state, existing_choices
+    )
+
+
+def hydrate_models_handler(
+    current_display_label: str,
+    config_state: AgentConfig,
+    existing_choices: list[tuple[str, str]] | None,
+) -> tuple[
+    list[tuple[str, str]],
+    str,
+    Literal["dynamic", "fallback"],
+    ComponentUpdate,
+    str,
+    AgentConfig,
+    str,
+    dict[str, str],
+]:
+    """Swap in the startup catalog once its background load has finished."""
+
+    choices, source_label, _, source_enum = prefetch_initial_models().result()
+    message = f"✅ Model catalog loaded: {len(choices)} options from {source_enum}."
+    return _catalog_ui_updates(
+        choices, source_label, source_enum, message, current_display_label, config_state, existing_choices
+    )
+
+
+def _catalog_ui_updates(
+    choices: list[tuple[str, str]],
+    source_label: str,
+    source_enum: Literal["dynamic", "fallback"],
+    message: str,
+    current_display_label: str,
+    config_state: AgentConfig,
+    existing_choices: list[tuple[str, str]] | None,
+) -> tuple[
+    list[tuple[str, str]],
+    str,
+    Literal["dynamic", "fallback"],
+    ComponentUpdate,
+    str,
+    AgentConfig,
+    str,
+    dict[str, str],
+]:
+    """Build the model selector updates for a newly loaded catalog."""
+
     # Create mapping: display_label -> model_id
     id_mapping = {choice[0]: choice[1] for choice in choices}
 
@@ -501,8 +626,18 @@ def refresh_models_handler(
         display_labels[0] if display_labels else DEFAULT_MODEL_ID
     )
 
-    dropdown_update = gr.update(choices=display_labels, value=selected_label)
-    updated_config = config_state.model_copy(update={"model": current_model_id})
+    # An unchanged catalog keeps the existing dropdown options instead of
+    # re-sending the whole list to the browser.
+    if existing_choices is not None and choices == [tuple(choice) for choice in existing_choices]:
+        choices = existing_choices
+        dropdown_update = gr.update(value=selected_label)
+    else:
+        dropdown_update = gr.update(choices=display_labels, value=selected_label)
+
+    if current_model_id == config_state.model:
+        updated_config = config_state
+    else:
+        updated_config = config_state.model_copy(update={"model": current_model_id})
 
     return (
         choices,
@@ -516,6 +651,138 @@ def refresh_models_handler(
     )
 
 
+def _stream_render_interval(default_s: float = 1 / 30) -> float:
+    """Read the minimum spacing between partial renders from UI_FLUSH_MS."""
+
+    raw = getenv("UI_FLUSH_MS")
+    if not raw:
+        return default_s
+    try:
+        flush_ms = float(raw)
+    except ValueError:
+        flush_ms = -1.0
+    if not 0 <= flush_ms < float("inf"):
+        logger.warning("Ignoring invalid UI_FLUSH_MS; using the default render interval.", extra={"value": raw})
+        return default_s
+    return flush_ms / 1000
+
+
+# Minimum spacing between partial renders while streaming (~30 Hz by default)
+STREAM_RENDER_INTERVAL_S = _stream_render_interval()
+
+# Chat streams are I/O-bound, so several can share the event loop; the queue
+# bound keeps a burst of users from piling up unbounded pending requests.
+STREAM_CONCURRENCY_LIMIT = 8
+QUEUE_MAX_SIZE = 64
+
+# Usage keys reported by different providers / pydantic-ai versions, in priority order
+_PROMPT_TOKEN_KEYS = ("prompt_tokens", "input_tokens", "request_tokens")
+_COMPLETION_TOKEN_KEYS = ("completion_tokens", "output_tokens", "response_tokens")
+_TOTAL_TOKEN_KEYS = ("total_tokens",)
+
+# Constant send/stop button updates shared across calls. Gradio only pops the
+# "value" key from update dicts, so payloads without one are never mutated.
+_SEND_IDLE: ComponentUpdate = gr.update(interactive=True)
+_SEND_DISABLED: ComponentUpdate = gr.update(interactive=False)
+_STOP_HIDDEN: ComponentUpdate = gr.update(visible=False)
+_STOP_VISIBLE: ComponentUpdate = gr.update(visible=True)
+_STOP_DISABLED: ComponentUpdate = gr.update(interactive=False)
+# Leaves an output unchanged, e.g. history_state on every frame but the last
+_NO_UPDATE: ComponentUpdate = gr.update()
+
+
+def _usage_int(usage: dict[str, Any], keys: tuple[str, ...]) -> int:
+    """Return the first usable integer among ``keys`` in a usage payload, else 0."""
+    for key in keys:
+        value = usage.get(key)
+        if value is not None:
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return 0
+    return 0
+
+
+def _usage_counts(usage: dict[str, Any] | None) -> tuple[int, int, int]:
+    """Return (prompt, completion, total) token counts from a usage payload."""
+    if not usage:
+        # Providers often omit usage on streamed replies
+        return 0, 0, 0
+    return (
+        _usage_int(usage, _PROMPT_TOKEN_KEYS),
+        _usage_int(usage, _COMPLETION_TOKEN_KEYS),
+        _usage_int(usage, _TOTAL_TOKEN_KEYS),
+    )
+
+
+# Run records waiting for the background CSV writer, which is bound to the
+# event loop that started it and restarted lazily if that loop changes.
+_run_queue: asyncio.Queue[RunRecord] | None = None
+_run_writer_task: asyncio.Task[None] | None = None
+# Set when the writer's most recent batch failed, cleared by the next success;
+# the streaming handler reads it to tell the user their runs aren't being saved.
+_run_writer_failed = False
+
+
+async def _run_writer_loop(queue: asyncio.Queue[RunRecord]) -> None:
+    """Append queued run records in batches, off the event loop."""
+    global _run_writer_failed
+
+    while True:
+        records = [await queue.get()]
+        while not queue.empty():
+            records.append(queue.get_nowait())
+        try:
+            await asyncio.to_thread(append_runs, records)
+            _run_writer_failed = False
+        except Exception as e:
+            _run_writer_failed = True
+            logger.warning("Failed to persist run data", extra={"error": str(e), "count": len(records)})
+        finally:
+            for _ in records:
+                queue.task_done()
+
+
+def _run_writer_queue() -> asyncio.Queue[RunRecord]:
+    """Return the writer's queue, (re)starting the writer on the running loop if needed."""
+    global _run_queue, _run_writer_task
+
+    loop = asyncio.get_running_loop()
+    if _run_queue is None or _run_writer_task is None or _run_writer_task.done() or _run_writer_task.get_loop() is not loop:
+        stale_queue, _run_queue = _run_queue, asyncio.Queue()
+        # Carry over records the previous writer never picked up
+        while stale_queue is not None and not stale_queue.empty():
+            _run_queue.put_nowait(stale_queue.get_nowait())
+            stale_queue.task_done()
+        _run_writer_task = loop.create_task(_run_writer_loop(_run_queue))
+    return _run_queue
+
+
+def _enqueue_run(record: RunRecord) -> None:
+    """Hand a run record to the background CSV writer without waiting on disk I/O."""
+    _run_writer_queue().put_nowait(record)
+
+
+async def flush_run_queue() -> None:
+    """Wait until every queued run record has been written."""
+    if _run_queue is not None:
+        await _run_writer_queue().join()
+
+
+@asynccontextmanager
+async def server_lifespan(_app: Any) -> AsyncIterator[None]:
+    """Release shared resources when the Gradio server shuts down.
+
+    Runs on the server's event loop, the one the chat handlers use.
+    """
+    try:
+        yield
+    finally:
+        # Write run records still queued rather than losing them at exit
+        await flush_run_queue()
+        await aclose_http_client()
+
+
 async def send_message_streaming_fixed(
     message: str,
     history: list[list[str]] | None,
@@ -537,6 +804,10 @@ async def send_message_streaming_fixed(
     - Proper cleanup on cancellation
     - State validation before yielding
     - Error recovery with meaningful messages
+
+    Every yield is ``(chatbot, history_state, run_info_display,
+    cancel_event_state, is_generating_state, send_btn, stop_btn)``, in the
+    order of the send button's ``outputs``.
     """
     correlation_id = f"stream_{asyncio.get_event_loop().time()}"
 
@@ -544,31 +815,23 @@ async def send_message_streaming_fixed(
         # Input validation and sanitization
         if not message or not message.strip():
             yield (
-                None,  # chat_history
-                None,  # agent_display
-                "Enter a message to send to the agent.",  # status_message
-                gr.update(interactive=True),  # send_button
-                gr.update(visible=False),  # cancel_button
-                None,  # model_display
-                None,  # agent_state
-                cancel_event_state,  # cancel_event
-                False,  # is_generating
-                None,  # experiment_id_display
-                None,  # task_label_display
-                None,  # run_notes_display
-                None,  # metadata_display
+                history,  # chatbot
+                _NO_UPDATE,  # history_state: only the final reply writes it
+                "Enter a message to send to the agent.",  # run_info_display
+                cancel_event_state,  # cancel_event_state
+                False,  # is_generating_state
+                _SEND_IDLE,  # send_btn
+                _STOP_HIDDEN,  # stop_btn
             )
             return
 
         sanitized_message = message.strip()
         if len(sanitized_message) > 10000:  # Reasonable message limit
             yield (
-                None,
-                None,
+                history,
+                _NO_UPDATE,
                 "Message too long. Please limit to 10,000 characters.",
-                gr.update(interactive=True),
-                gr.update(visible=False),
-                None, None, None, False, None, None, None, None
+                None, False, _SEND_IDLE, _STOP_HIDDEN
             )
             return
 
@@ -576,73 +839,132 @@ async def send_message_streaming_fixed(
         if cancel_event_state and cancel_event_state.is_set():
             yield (
                 history,
-                None,
+                _NO_UPDATE,
                 "Generation cancelled before starting.",
-                gr.update(interactive=True),
-                gr.update(visible=False),
-                None, None, None, False, None, None, None, None
+                None, False, _SEND_IDLE, _STOP_HIDDEN
             )
             return
 
         # Build agent with error handling
         try:
-            include_web = "web_fetch" in getattr(config_state, 'tools', [])
-            agent = build_agent(config_state, include_web=include_web)
+            include_web = config_state.web_tool_enabled
+            agent = get_agent(config_state, include_web=include_web)
         except Exception as e:
             logger.error("Failed to build agent", extra={"error": str(e)})
             yield (
                 history,
-                None,
+                _NO_UPDATE,
                 f"Failed to initialize agent: {str(e)}",
-                gr.update(interactive=True),
-                gr.update(visible=False),
-                None, None, None, False, None, None, None, None
+                None, False, _SEND_IDLE, _STOP_HIDDEN
             )
             return
 
         # Initialize streaming state
-        collected_deltas = []
-        start_time = asyncio.get_event_loop().time()
+        delta_queue: asyncio.Queue[str] = asyncio.Queue()
+        delta_ready = asyncio.Event()
+        partial_text = ""
+        loop = asyncio.get_event_loop()
+        start_time = loop.time()
 
         def on_delta(delta: str) -> None:
-            """Accumulate streaming deltas."""
+            """Queue streaming deltas for the next render."""
             if delta and not (cancel_event_state and cancel_event_state.is_set()):
-                collected_deltas.append(delta)
+                delta_queue.put_nowait(delta)
+                delta_ready.set()
+
+        def drain_deltas() -> str:
+            """Take every queued delta as a single string."""
+            batch = []
+            while not delta_queue.empty():
+                batch.append(delta_queue.get_nowait())
+            return "".join(batch)
 
-        # Create new cancel event if none provided
-        active_cancel_event = cancel_event_state or Event()
+        # Create new cancel event if none provided; the stop handler sets it
+        # from a worker thread, and it wakes the stream mid-read
+        active_cancel_event = cancel_event_state or StreamCancelEvent()
 
         # Yield initial streaming state
+        # The stop button reads the cancel event back from cancel_event_state
         yield (
             history,
-            None,
+            _NO_UPDATE,
             "Generating response...",
-            gr.update(interactive=False),
-            gr.update(visible=True),
-            None,
-            agent,
             active_cancel_event,
             True,
-            experiment_id or "",
-            task_label or "",
-            run_notes or "",
-            None
+            _SEND_DISABLED,
+            _STOP_VISIBLE,
         )
 
         # Perform streaming with comprehensive error handling
         try:
-            stream_result = await run_agent_stream(
+            stream_extras = getattr(config_state, 'extras', None) or {}
+            stream_task = asyncio.create_task(run_agent_stream(
                 agent, sanitized_message, on_delta, active_cancel_event,
-                correlation_id=correlation_id
-            )
+                correlation_id=correlation_id,
+                # The handler already accumulates every delta for rendering,
+                # so the runtime doesn't need to keep a second copy.
+                collect=False,
+                coalesce_ms=stream_extras.get("stream_coalesce_ms", 0.0),
+                coalesce_chars=stream_extras.get("stream_coalesce_chars", 256),
+            ))
+
+            # Render the partial response at most once per interval, and only
+            # when new text arrived, instead of re-sending the whole chat
+            # history to the browser for every token. Each render appends
+            # only the deltas queued since the previous one.
+            last_render = float("-inf")
+            # The displayed history is copied once, on the first render, and
+            # later frames only update the pending turn; history_state itself
+            # is left untouched until the reply completes.
+            pending_turn = [sanitized_message, ""]
+            display_history: list | None = None
+            try:
+                while not stream_task.done():
+                    # Sleep until the first delta of a frame (or the end of
+                    # the stream) rather than waking on a timer while idle...
+                    delta_wait = asyncio.create_task(delta_ready.wait())
+                    try:
+                        await asyncio.wait({stream_task, delta_wait}, return_when=asyncio.FIRST_COMPLETED)
+                    finally:
+                        delta_wait.cancel()
+                    # ...then hold it until the interval since the previous
+                    # render has passed, so text after a pause shows at once
+                    remaining = STREAM_RENDER_INTERVAL_S - (loop.time() - last_render)
+                    if remaining > 0:
+                        await asyncio.wait({stream_task}, timeout=remaining)
+                    delta_ready.clear()
+                    if stream_task.done() or delta_queue.empty():
+                        continue
+                    partial_text += drain_deltas()
+                    pending_turn[1] = partial_text
+                    if display_history is None:
+                        display_history = [*(history or []), pending_turn]
+                    last_render = loop.time()
+                    yield (
+                        display_history,
+                        _NO_UPDATE,
+                        "Generating response...",
+                        active_cancel_event,
+                        True,
+                        _SEND_DISABLED,
+                        _STOP_VISIBLE,
+                    )
+            finally:
+                # The UI may close this generator mid-stream; don't leak the task
+                if not stream_task.done():
+                    stream_task.cancel()
+
+            stream_result = await stream_task
+            final_text = partial_text + drain_deltas()
 
             # Check if cancelled during streaming
             if active_cancel_event.is_set() or stream_result.aborted:
-                final_text = "".join(collected_deltas)
                 status_msg = f"Generation cancelled. Partial response: {len(final_text)} characters."
             else:
-                final_text = stream_result.text
                 status_msg = "Response generated"
+            if _run_writer_failed:
+                # Details stay in the server log rather than the UI
+                status_msg += " (run telemetry is not being saved; see server logs)"
 
             # Prepare final history
             new_history = history or []
@@ -650,13 +972,17 @@ async def send_message_streaming_fixed(
 
             # Persist run data
             try:
-                run_record = RunRecord(
+                # Every field is derived here from already-validated state, so
+                # skip pydantic validation; provider token counts are coerced
+                # explicitly because they are external input.
+                prompt_tokens, completion_tokens, total_tokens = _usage_counts(stream_result.usage)
+                run_record = RunRecord.model_construct(
                     ts=datetime.now(timezone.utc),
                     agent_name=config_state.name,
                     model=config_state.model,
-                    prompt_tokens=stream_result.usage.get("prompt_tokens", 0) if stream_result.usage else 0,
-                    completion_tokens=stream_result.usage.get("completion_tokens", 0) if stream_result.usage else 0,
-                    total_tokens=stream_result.usage.get("total_tokens", 0) if stream_result.usage else 0,
+                    prompt_tokens=prompt_tokens,
+                    completion_tokens=completion_tokens,
+                    total_tokens=total_tokens,
                     latency_ms=stream_result.latency_ms,
                     cost_usd=0.0,  # TODO: Implement calculate_cost function
                     experiment_id=experiment_id or "",
@@ -668,7 +994,9 @@ async def send_message_streaming_fixed(
                     web_status="ok" if include_web else "off",
                     aborted=stream_result.aborted
                 )
-                await asyncio.to_thread(append_run, run_record, correlation_id)
+                # Written by the background writer so the final render doesn't
+                # wait on disk; write failures are logged there.
+                _enqueue_run(run_record)
             except Exception as e:
                 logger.warning("Failed to persist run data", extra={"error": str(e)})
                 # Don't fail the UI for persistence errors
@@ -676,22 +1004,12 @@ async def send_message_streaming_fixed(
             # Final yield with complete state
             yield (
                 new_history,
-                None,
+                new_history,  # history_state, written once per reply
                 status_msg,
-                gr.update(interactive=True),
-                gr.update(visible=False),
-                None,
-                None,
-                None,
+                None,  # the reply is over; a stale event must not cancel the next one
                 False,
-                experiment_id or "",
-                task_label or "",
-                run_notes or "",
-                {
-                    "latency_ms": stream_result.latency_ms,
-                    "usage": stream_result.usage,
-                    "aborted": stream_result.aborted
-                }
+                _SEND_IDLE,
+                _STOP_HIDDEN,
             )
 
         except Exception as e:
@@ -701,22 +1019,18 @@ async def send_message_streaming_fixed(
             # Yield error state
             yield (
                 history,
-                None,
+                _NO_UPDATE,
                 error_msg,
-                gr.update(interactive=True),
-                gr.update(visible=False),
-                None, None, None, False, None, None, None, None
+                None, False, _SEND_IDLE, _STOP_HIDDEN
             )
 
     except Exception as e:
         logger.error("Unexpected error in send_message_streaming", extra={"error": str(e)})
         yield (
             history,
-            None,
+            _NO_UPDATE,
             f"Unexpected error: {str(e)}",
-            gr.update(interactive=True),
-            gr.update(visible=False),
-            None, None, None, False, None, None, None, None
+            None, False, _SEND_IDLE, _STOP_HIDDEN
         )
 
 
@@ -732,9 +1046,9 @@ def stop_generation(
     status_text = "⏹️ Stopping..." if is_generating else "⚠️ No generation in progress."
     # Security: disable buttons to avoid duplicate stop requests while the stream halts.
     send_update: ComponentUpdate | None = (
-        gr.update(interactive=False) if is_generating else None
+        _SEND_DISABLED if is_generating else None
     )
-    stop_update: ComponentUpdate = gr.update(interactive=False)
+    stop_update: ComponentUpdate = _STOP_DISABLED
 
     return status_text, cancel_event, is_generating, send_update, stop_update
 
@@ -747,15 +1061,21 @@ def save_session_handler(
 ) -> tuple[Session | None, str, list[tuple[str, str]], ComponentUpdate]:
     """Save current session to disk with user-provided name."""
     if not session_name.strip():
-        return current_session, "?? Please enter a session name", [], gr.update()
-
-    # Create new session or update existing
+        return current_session, "⚠️ Please enter a session name", [], gr.update()
+
+    # Create new session or update existing; every message of one save shares
+    # the save time, so the clock is read once
+    now = datetime.now(timezone.utc)
+    now_iso = now.isoformat()
+    transcript = []
+    for user_msg, assistant_msg in history_state:
+        transcript.append({"role": "user", "content": user_msg, "ts": now_iso})
+        transcript.append({"role": "assistant", "content": assistant_msg, "ts": now_iso})
     session = Session(
         id=current_session.id if current_session else str(uuid4()),
-        created_at=current_session.created_at if current_session else datetime.now(timezone.utc),
+        created_at=current_session.created_at if current_session else now,
         agent_config=config_state,
-        transcript=[{"role": msg[0], "content": msg[1], "ts": datetime.now(timezone.utc).isoformat()}
-                   for pair in history_state for msg in [("user", pair[0]), ("assistant", pair[1])]],
+        transcript=transcript,
         model_id=config_state.model,
         notes=session_name
     )
@@ -763,9 +1083,9 @@ def save_session_handler(
     try:
         path = save_session(session)
         sessions_list = [(s[0], s[0]) for s in list_sessions()]
-        return session, f"? Saved: {path.name}", sessions_list, gr.update(choices=sessions_list)
+        return session, f"✅ Saved: {path.name}", sessions_list, gr.update(choices=sessions_list)
     except Exception as exc:
-        return current_session, f"? Save failed: {exc}", [], gr.update()
+        return current_session, f"❌ Save failed: {exc}", [], gr.update()
 
 
 def load_session_handler(
@@ -774,29 +1094,28 @@ def load_session_handler(
 ) -> tuple[Session | None, str, list, AgentConfig, str, str, str, float, float, bool, list, dict]:
     """Load session from disk and restore all state."""
     if not session_name:
-        return None, "?? Select a session to load", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
+        return None, "⚠️ Select a session to load", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
 
     try:
         sessions = {s[0]: s[1] for s in list_sessions()}
         if session_name not in sessions:
-            return None, f"? Session not found: {session_name}", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
+            return None, f"❌ Session not found: {session_name}", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
 
         session = load_session(sessions[session_name])
 
-        # Reconstruct chat history
-        history = []
-        transcript = session.transcript
-        for i in range(0, len(transcript), 2):
-            if i + 1 < len(transcript):
-                user_msg = transcript[i]["content"]
-                asst_msg = transcript[i + 1]["content"]
-                history.append([user_msg, asst_msg])
+        # Reconstruct chat history from consecutive user/assistant messages;
+        # a trailing unpaired message is dropped
+        messages = iter(session.transcript)
+        history = [[user_msg["content"], asst_msg["content"]] for user_msg, asst_msg in zip(messages, messages)]
 
         cfg = session.agent_config
 
-        # Find display label for loaded model ID
-        reverse_mapping = {v: k for k, v in id_mapping.items()}
-        model_display_label = reverse_mapping.get(cfg.model, cfg.model)
+        # Find display label for loaded model ID; scanning from the end keeps
+        # the last label for an id without building a reverse mapping
+        model_display_label = next(
+            (label for label, model_id in reversed(id_mapping.items()) if model_id == cfg.model),
+            cfg.model,
+        )
 
         # Prepare metadata for display
         metadata = {
@@ -809,7 +1128,7 @@ def load_session_handler(
 
         return (
             session,
-            f"? Loaded: {session_name}",
+            f"✅ Loaded: {session_name}",
             history,
             cfg,
             cfg.name,
@@ -817,17 +1136,17 @@ def load_session_handler(
             cfg.system_prompt,
             cfg.temperature,
             cfg.top_p,
-            "web_fetch" in cfg.tools,
+            cfg.web_tool_enabled,
             history,  # transcript_preview
             metadata  # session_metadata
         )
     except Exception as exc:
-        return None, f"? Load failed: {exc}", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
+        return None, f"❌ Load failed: {exc}", [], DEFAULT_AGENT_CONFIG, "", "", "", 0.7, 1.0, False, [], {}
 
 
 def new_session_handler() -> tuple[None, str, list, str, list, dict]:
     """Clear current session and start fresh."""
-    return None, "?? New session started", [], "", [], {}
+    return None, "🆕 New session started", [], "", [], {}
 
 
 async def optimize_parameters_handler(
@@ -837,11 +1156,11 @@ async def optimize_parameters_handler(
     current_temperature: float,
     current_top_p: float,
     id_mapping: dict[str, str]
-) -> tuple[str, dict, ComponentUpdate]:
+) -> tuple[str, ComponentUpdate]:
     """Handle parameter optimization requests."""
     try:
         if not task_description or not task_description.strip():
-            return "❌ Please describe your task first", {}, gr.update(visible=False)
+            return "❌ Please describe your task first", gr.update(value={}, visible=False)
 
         # Resolve model ID from display label
         model_id = id_mapping.get(model_display_label, model_display_label)
@@ -883,17 +1202,17 @@ async def optimize_parameters_handler(
 
         status_msg = f"✅ Parameters optimized for {response.use_case_detection.detected_use_case.value.replace('_', ' ')} (confidence: {response.use_case_detection.confidence_score:.1%})"
 
-        return status_msg, recommendations, gr.update(visible=True)
+        return status_msg, gr.update(value=recommendations, visible=True)
 
     except Exception as e:
         logger.error(f"Parameter optimization failed: {e}")
-        return f"❌ Optimization failed: {str(e)}", {}, gr.update(visible=False)
+        return f"❌ Optimization failed: {str(e)}", gr.update(value={}, visible=False)
 
 
 async def smart_defaults_handler(
     model_display_label: str,
     id_mapping: dict[str, str]
-) -> tuple[str, dict, ComponentUpdate]:
+) -> tuple[str, ComponentUpdate]:
     """Handle smart defaults requests."""
     try:
         # Resolve model ID from display label
@@ -920,11 +1239,11 @@ async def smart_defaults_handler(
 
         status_msg = f"✅ Smart defaults applied (confidence: {response.confidence_score:.1%})"
 
-        return status_msg, recommendations, gr.update(visible=True)
+        return status_msg, gr.update(value=recommendations, visible=True)
 
     except Exception as e:
         logger.error(f"Smart defaults failed: {e}")
-        return f"❌ Smart defaults failed: {str(e)}", {}, gr.update(visible=False)
+        return f"❌ Smart defaults failed: {str(e)}", gr.update(value={}, visible=False)
 
 
 def apply_optimized_parameters(
@@ -1018,10 +1337,24 @@ def handle_accessibility_shortcut(shortcut_action: str) -> tuple[str, ComponentU
 def create_ui() -> gr.Blocks:
     """Construct the tabbed Gradio Blocks layout for Agent Lab optimized for 16:9 displays."""
 
+    # Render straight away with the bundled catalog if the startup fetch is slow;
+    # the page-load event below swaps in the fetched catalog when it arrives.
+    try:
+        initial_catalog = prefetch_initial_models().result(timeout=INITIAL_CATALOG_WAIT_S)
+        hydrate_catalog = False
+    except FuturesTimeoutError:
+        initial_catalog = _fallback_catalog()
+        hydrate_catalog = True
+    initial_choices, initial_source_label, _, initial_source_enum = initial_catalog
+    initial_dropdown_values = [choice[0] for choice in initial_choices]
+    initial_model_id = initial_choices[0][1] if initial_choices else DEFAULT_MODEL_ID
+
     # Combine all UX improvement CSS
     ux_css = ENHANCED_ERROR_CSS + LOADING_STATES_CSS + SESSION_WORKFLOW_CSS + PARAMETER_TOOLTIPS_CSS + TRANSITIONS_CSS + ACCESSIBILITY_CSS
 
-    with gr.Blocks(title="Agent Lab", css=ux_css, elem_id="agent-lab-app") as demo:
+    # Security: no Gradio usage analytics, so launching the lab makes no
+    # background calls to third-party endpoints.
+    with gr.Blocks(title="Agent Lab", css=ux_css, elem_id="agent-lab-app", analytics_enabled=False) as demo:
         # ARIA live region for announcements
         status_announcements = gr.HTML(
             value="",
@@ -1030,16 +1363,16 @@ def create_ui() -> gr.Blocks:
             elem_classes=["sr-only", "live-region"]
         )
 
-        config_state = gr.State(DEFAULT_AGENT_CONFIG)
+        config_state = gr.State(DEFAULT_AGENT_CONFIG.model_copy(update={"model": initial_model_id}))
         agent_state = gr.State(None)
         history_state = gr.State([])
         cancel_event_state = gr.State(None)
         is_generating_state = gr.State(False)
-        model_choices_state = gr.State(INITIAL_MODEL_CHOICES)
-        model_source_label_state = gr.State(INITIAL_MODEL_SOURCE_LABEL)
-        model_source_enum_state = gr.State(INITIAL_MODEL_SOURCE_ENUM)
+        model_choices_state = gr.State(initial_choices)
+        model_source_label_state = gr.State(initial_source_label)
+        model_source_enum_state = gr.State(initial_source_enum)
         model_id_mapping_state = gr.State({
-            choice[0]: choice[1] for choice in INITIAL_MODEL_CHOICES
+            choice[0]: choice[1] for choice in initial_choices
         })
         current_session_state = gr.State(None)
 
@@ -1120,15 +1453,15 @@ def create_ui() -> gr.Blocks:
 
                         model_selector = gr.Dropdown(
                             label="Model",
-                            choices=INITIAL_DROPDOWN_VALUES or [DEFAULT_MODEL_ID],
-                            value=INITIAL_DROPDOWN_VALUES[0] if INITIAL_DROPDOWN_VALUES else DEFAULT_MODEL_ID,
+                            choices=initial_dropdown_values or [DEFAULT_MODEL_ID],
+                            value=initial_dropdown_values[0] if initial_dropdown_values else DEFAULT_MODEL_ID,
                             filterable=True,
                             info="Start typing to search models by name or provider",
                             elem_id="model-selector",
                             elem_classes=["form-input"]
                         )
                         model_source_indicator = gr.Markdown(
-                            value=_format_source_display(INITIAL_MODEL_SOURCE_LABEL),
+                            value=_format_source_display(initial_source_label),
                             elem_id="model-source",
                             elem_classes=["status-info"]
                         )
@@ -1249,7 +1582,7 @@ def create_ui() -> gr.Blocks:
                     with gr.Column(scale=1):
                         gr.Markdown("## Model Information & Validation")
                         web_badge = gr.HTML(
-                            value="<span style=\"background:#666;color:white;padding:4px 8px;border-radius:4px;\">Web Tool: OFF</span>",
+                            value=_WEB_BADGE_OFF,
                             elem_id="web-badge"
                         )
                         validation_status = gr.Markdown(
@@ -1468,8 +1801,7 @@ def create_ui() -> gr.Blocks:
             ],
             outputs=[
                 optimization_status,
-                parameter_recommendations,
-                parameter_recommendations,  # Show recommendations
+                parameter_recommendations,  # Value and visibility in one update
             ],
         )
 
@@ -1481,8 +1813,7 @@ def create_ui() -> gr.Blocks:
             ],
             outputs=[
                 optimization_status,
-                parameter_recommendations,
-                parameter_recommendations,  # Show recommendations
+                parameter_recommendations,  # Value and visibility in one update
             ],
         )
 
@@ -1560,6 +1891,7 @@ def create_ui() -> gr.Blocks:
                 send_btn,
                 stop_btn,
             ],
+            concurrency_limit=STREAM_CONCURRENCY_LIMIT,
         )
 
         stop_btn.click(
@@ -1570,10 +1902,14 @@ def create_ui() -> gr.Blocks:
 
         # Enhanced session management with workflow integration
         def save_session_with_status_update(session_name, config, history, current_session):
-            result = save_session_handler(session_name, config, history, current_session)
+            # Only the choices update goes to the session dropdown; the raw
+            # list is for direct callers and would overwrite its selection
+            session, status, _, session_list_update = save_session_handler(
+                session_name, config, history, current_session
+            )
             # Update status indicator
             status_html = render_session_status_indicator("current", {"state": "saved"})
-            return result + (status_html,)
+            return session, status, session_list_update, status_html
 
         def load_session_with_status_update(session_name, id_mapping):
             result = load_session_handler(session_name, id_mapping)
@@ -1591,7 +1927,7 @@ def create_ui() -> gr.Blocks:
         save_session_btn.click(
             fn=save_session_with_status_update,
             inputs=[session_name_input, config_state, history_state, current_session_state],
-            outputs=[current_session_state, session_status, session_list, session_list, session_status_indicator]
+            outputs=[current_session_state, session_status, session_list, session_status_indicator]
         )
 
         load_session_btn.click(
@@ -1609,6 +1945,22 @@ def create_ui() -> gr.Blocks:
             outputs=[current_session_state, session_status, history_state, session_name_input, transcript_preview, session_metadata, session_status_indicator]
         )
 
+        if hydrate_catalog:
+            demo.load(
+                fn=hydrate_models_handler,
+                inputs=[model_selector, config_state, model_choices_state],
+                outputs=[
+                    model_choices_state,
+                    model_source_label_state,
+                    model_source_enum_state,
+                    model_selector,
+                    model_source_indicator,
+                    config_state,
+                    run_info_display,
+                    model_id_mapping_state,
+                ],
+            )
+
         # Populate session list on app load
         demo.load(
             fn=lambda: [(s[0], s[0]) for s in list_sessions()],
@@ -1625,6 +1977,7 @@ def create_ui() -> gr.Blocks:
 
 
 if __name__ == "__main__":
+    prefetch_initial_models()
     init_csv()
 
     # Add health check endpoint
@@ -1639,5 +1992,6 @@ if __name__ == "__main__":
 
     # Security: Configurable server host binding with secure default
     server_host = getenv("GRADIO_SERVER_HOST", "127.0.0.1")
-    app.launch(server_name=server_host, server_port=7860)
+    app.queue(default_concurrency_limit=STREAM_CONCURRENCY_LIMIT, max_size=QUEUE_MAX_SIZE)
+    app.launch(server_name=server_host, server_port=7860, app_kwargs={"lifespan": server_lifespan})
     print("Telemetry CSV initialized.")
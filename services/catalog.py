@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import os
+import threading
+from concurrent.futures import Future
 from datetime import datetime, timedelta, timezone
 from typing import Literal, Optional
 
@@ -57,6 +59,11 @@ _cached_models: Optional[list[ModelInfo]] = None
 _cache_timestamp: Optional[datetime] = None
 _cache_source: Literal["dynamic", "fallback"] = "fallback"
 
+# Fetch currently talking to OpenRouter; concurrent callers wait on it instead of
+# starting their own request (e.g. several quick clicks on "Refresh models").
+_fetch_in_flight: Optional[Future] = None
+_fetch_lock = threading.Lock()
+
 
 def _parse_price(value: Optional[str | float]) -> Optional[float]:
     """Coerce API price fields into floats when possible."""
@@ -223,7 +230,35 @@ def get_models(force_refresh: bool = False) -> tuple[list[ModelInfo], Literal["d
         }
     )
 
-    return fetch_models()
+    return _fetch_models_shared()
+
+
+def _fetch_models_shared() -> tuple[list[ModelInfo], Literal["dynamic", "fallback"], datetime]:
+    """Run fetch_models, or join the fetch another caller already started."""
+
+    global _fetch_in_flight
+
+    with _fetch_lock:
+        future = _fetch_in_flight
+        leader = future is None
+        if leader:
+            future = _fetch_in_flight = Future()
+
+    if not leader:
+        logger.debug("Joining in-flight model fetch")
+        return future.result()
+
+    try:
+        result = fetch_models()
+    except BaseException as exc:
+        future.set_exception(exc)
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        with _fetch_lock:
+            _fetch_in_flight = None
 
 
 def get_model_choices() -> list[tuple[str, str]]:
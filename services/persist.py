@@ -9,10 +9,12 @@ from __future__ import annotations
 
 import csv
 import sys
+import threading
 from datetime import datetime
 from loguru import logger
+from pydantic import ValidationError
 from pathlib import Path
-from typing import Any, cast, Literal
+from typing import Any, Sequence, cast, Literal
 
 PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
@@ -45,6 +47,12 @@ _INT_FIELDS = {"prompt_tokens", "completion_tokens", "total_tokens", "latency_ms
 _FLOAT_FIELDS = {"cost_usd"}
 _BOOL_FIELDS = {"streaming", "tool_web_enabled", "aborted"}
 
+# Display label and creation time of each parsed session file, keyed by path and
+# tagged with the file's (mtime_ns, size) so only new or rewritten files are parsed.
+# Directory mtime alone is not enough: re-saving a session rewrites its file in place.
+_SESSION_INDEX: dict[Path, tuple[tuple[int, int], str, datetime]] = {}
+_SESSION_INDEX_LOCK = threading.Lock()
+
 
 def init_csv() -> None:
     """Initialize CSV file with headers if it doesn't exist"""
@@ -64,22 +72,35 @@ def init_csv() -> None:
 def append_run(record: RunRecord, correlation_id: str | None = None) -> None:
     """Append a run record to the CSV file"""
 
+    append_runs([record], correlation_id)
+
+
+def append_runs(records: Sequence[RunRecord], correlation_id: str | None = None) -> None:
+    """Append several run records to the CSV file with a single open and write"""
+
+    if not records:
+        return
+
     logger_bound = logger.bind(correlation_id=correlation_id) if correlation_id else logger
 
     init_csv()
-    row = record.model_dump()
-    row["ts"] = record.ts.isoformat()
-
-    serialised_row = {header: row.get(header, "") for header in CSV_HEADERS}
+    serialised_rows = []
+    for record in records:
+        row = record.model_dump()
+        row["ts"] = record.ts.isoformat()
+        serialised_rows.append({header: row.get(header, "") for header in CSV_HEADERS})
 
     try:
         with CSV_PATH.open("a", newline="", encoding="utf-8") as file:
             writer = csv.DictWriter(file, fieldnames=CSV_HEADERS)
-            writer.writerow(serialised_row)
-        logger_bound.info("Run record appended to CSV", extra={"record_id": str(record.ts)})
+            writer.writerows(serialised_rows)
+        logger_bound.info(
+            "Run records appended to CSV",
+            extra={"record_ids": [str(record.ts) for record in records]},
+        )
     except OSError as exc:  # pragma: no cover - filesystem failure paths
-        logger_bound.error("Failed to append run record", extra={"error": str(exc)})
-        raise RuntimeError(f"Failed to append run record: {exc}") from exc
+        logger_bound.error("Failed to append run records", extra={"error": str(exc), "count": len(records)})
+        raise RuntimeError(f"Failed to append run records: {exc}") from exc
 
 
 def _coerce_int_robust(value: str) -> int:
@@ -230,7 +251,9 @@ def _parse_row_robust(row: dict[str, str]) -> RunRecord | None:
         tool_web_enabled = _coerce_bool_robust(row.get('tool_web_enabled', 'false'))
         aborted = _coerce_bool_robust(row.get('aborted', 'false'))
 
-        return RunRecord(
+        # Every field above is already coerced to its declared type, so skip
+        # re-validation; this runs once per CSV row when loading history.
+        return RunRecord.model_construct(
             ts=ts,
             agent_name=agent_name,
             model=model,
@@ -288,9 +311,12 @@ def save_session(session: Session) -> Path:
     session_path = SESSIONS_DIR / f"{session.id}.json"
 
     try:
+        # Serialise in pydantic-core in one pass rather than building an
+        # intermediate dict for the stdlib encoder; unknown transcript values
+        # still fall back to str() as before.
+        payload = session.model_dump_json(indent=2, fallback=str)
         with session_path.open("w", encoding="utf-8") as file:
-            import json
-            json.dump(session.model_dump(), file, indent=2, default=str)
+            file.write(payload)
     except OSError as exc:
         raise RuntimeError(f"Failed to save session to {session_path}: {exc}") from exc
 
@@ -302,15 +328,18 @@ def load_session(session_path: Path | str) -> Session:
     if isinstance(session_path, str):
         session_path = Path(session_path)
     try:
-        with session_path.open("r", encoding="utf-8") as file:
-            import json
-            data = json.load(file)
+        payload = session_path.read_bytes()
     except OSError as exc:
         raise RuntimeError(f"Failed to load session from {session_path}: {exc}") from exc
-    except json.JSONDecodeError as exc:
-        raise RuntimeError(f"Invalid JSON in session file {session_path}: {exc}") from exc
 
-    return dict_to_session(data)
+    # Parse and validate in pydantic-core in one pass, mirroring save_session,
+    # instead of building an intermediate dict with the stdlib decoder.
+    try:
+        return Session.model_validate_json(payload)
+    except ValidationError as exc:
+        if any(error["type"] == "json_invalid" for error in exc.errors()):
+            raise RuntimeError(f"Invalid JSON in session file {session_path}: {exc}") from exc
+        raise
 
 
 def list_sessions() -> list[tuple[str, Path]]:
@@ -318,21 +347,31 @@ def list_sessions() -> list[tuple[str, Path]]:
     if not SESSIONS_DIR.exists():
         return []
 
-    sessions = []
-    try:
-        for session_file in SESSIONS_DIR.glob("*.json"):
-            try:
-                session = load_session(session_file)
-                sessions.append((session.notes or f"Session {session.id[:8]}", session_file))
-            except Exception:
-                # Skip corrupted session files
-                continue
-    except OSError:
-        return []
+    index: dict[Path, tuple[tuple[int, int], str, datetime]] = {}
+    with _SESSION_INDEX_LOCK:
+        try:
+            for session_file in SESSIONS_DIR.glob("*.json"):
+                try:
+                    stat = session_file.stat()
+                    version = (stat.st_mtime_ns, stat.st_size)
+                    entry = _SESSION_INDEX.get(session_file)
+                    if entry is None or entry[0] != version:
+                        session = load_session(session_file)
+                        entry = (version, session.notes or f"Session {session.id[:8]}", session.created_at)
+                except Exception:
+                    # Skip corrupted session files
+                    continue
+                index[session_file] = entry
+        except OSError:
+            return []
+
+        # Keep only files seen in this listing, dropping deleted or corrupted ones
+        _SESSION_INDEX.clear()
+        _SESSION_INDEX.update(index)
 
     # Sort by creation time (newest first)
-    sessions.sort(key=lambda x: load_session(x[1]).created_at, reverse=True)
-    return sessions
+    sessions = sorted(index.items(), key=lambda item: item[1][2], reverse=True)
+    return [(label, path) for path, (_, label, _) in sessions]
 
 
 def session_to_dict(session: Session) -> dict:
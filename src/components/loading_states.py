@@ -5,9 +5,27 @@ for various asynchronous operations throughout the application.
 """
 
 import asyncio
+import time
 from typing import Dict, Any, Optional, List
 import gradio as gr
-from datetime import datetime
+
+
+# Operation lookup tables, built once rather than on every call
+_PROGRESS_OPERATIONS = frozenset({"session_load", "model_refresh", "data_export", "message_send"})
+_BUTTONS_TO_DISABLE: Dict[str, tuple[str, ...]] = {
+    "message_send": ("send-btn", "stop-btn"),
+    "session_save": ("save-btn", "load-btn"),
+    "model_refresh": ("refresh-models", "build-agent"),
+    "session_load": ("load-session", "save-session", "new-session"),
+}
+_ANIMATIONS = {
+    "message_send": "skeleton",
+    "model_refresh": "progress",
+    "session_load": "progress",
+    "session_save": "spinner",
+    "data_export": "progress",
+}
+_CANCELLABLE_OPERATIONS = frozenset({"message_send", "model_refresh", "data_export"})
 
 
 class LoadingStateManager:
@@ -32,7 +50,8 @@ class LoadingStateManager:
             self.active_operations[operation_id] = {
                 "type": operation_type,
                 "message": message,
-                "start_time": datetime.now(),
+                # Monotonic: only used for the duration, and immune to clock changes
+                "start_time": time.monotonic(),
                 "progress": 0
             }
 
@@ -81,10 +100,10 @@ class LoadingStateManager:
         async with self._lock:
             if operation_id in self.active_operations:
                 operation = self.active_operations[operation_id]
-                duration = datetime.now() - operation["start_time"]
+                duration_s = time.monotonic() - operation["start_time"]
 
                 # Log completion
-                print(f"Operation {operation_id} completed in {duration.total_seconds():.2f}s")
+                print(f"Operation {operation_id} completed in {duration_s:.2f}s")
 
                 del self.active_operations[operation_id]
 
@@ -107,18 +126,11 @@ class LoadingStateManager:
 
     def _should_show_progress(self, operation_type: str) -> bool:
         """Determine if progress bar should be shown for operation type."""
-        progress_operations = ["session_load", "model_refresh", "data_export", "message_send"]
-        return operation_type in progress_operations
+        return operation_type in _PROGRESS_OPERATIONS
 
     def _get_buttons_to_disable(self, operation_type: str) -> List[str]:
         """Return list of button IDs to disable during operation."""
-        disable_map = {
-            "message_send": ["send-btn", "stop-btn"],
-            "session_save": ["save-btn", "load-btn"],
-            "model_refresh": ["refresh-models", "build-agent"],
-            "session_load": ["load-session", "save-session", "new-session"]
-        }
-        return disable_map.get(operation_type, [])
+        return list(_BUTTONS_TO_DISABLE.get(operation_type, ()))
 
 
 def render_loading_overlay(operation_type: str, message: str, progress: float) -> str:
@@ -220,14 +232,7 @@ def get_animation_for_operation(operation_type: str) -> str:
     Returns:
         Animation type ("spinner", "skeleton", "progress")
     """
-    animation_map = {
-        "message_send": "skeleton",
-        "model_refresh": "progress",
-        "session_load": "progress",
-        "session_save": "spinner",
-        "data_export": "progress"
-    }
-    return animation_map.get(operation_type, "spinner")
+    return _ANIMATIONS.get(operation_type, "spinner")
 
 
 def is_cancellable(operation_type: str) -> bool:
@@ -239,8 +244,7 @@ def is_cancellable(operation_type: str) -> bool:
     Returns:
         True if operation can be cancelled
     """
-    cancellable_ops = ["message_send", "model_refresh", "data_export"]
-    return operation_type in cancellable_ops
+    return operation_type in _CANCELLABLE_OPERATIONS
 
 
 def render_success_feedback(message: str = "Operation completed successfully", duration_ms: int = 1000) -> str:
@@ -171,4 +171,43 @@ def configure_loguru_for_testing():
         lambda msg: logging.getLogger("agents").log(msg.record["level"].no, msg.record["message"]),
         level="DEBUG",
         format="{message}"
-    )
\ No newline at end of file
+    )
+
+@pytest.fixture(autouse=True)
+def reset_openai_client_cache():
+    """
+    Clear the shared OpenAI client and agent caches so patched objects never leak between tests.
+    """
+    import agents.runtime
+
+    agents.runtime._OPENAI_CLIENTS.clear()
+    agents.runtime._AGENTS.clear()
+    yield
+    agents.runtime._OPENAI_CLIENTS.clear()
+    agents.runtime._AGENTS.clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_fetch_http_client():
+    """
+    Drop the shared fetch_url HTTP client so each test builds (or patches) its own.
+    """
+    import agents.tools
+
+    agents.tools._http_client = None
+    agents.tools._http_client_loop = None
+    yield
+    agents.tools._http_client = None
+    agents.tools._http_client_loop = None
+
+
+@pytest.fixture(autouse=True)
+def reset_session_index():
+    """
+    Forget parsed session listings so each test lists its own sessions directory.
+    """
+    import services.persist
+
+    services.persist._SESSION_INDEX.clear()
+    yield
+    services.persist._SESSION_INDEX.clear()
@@ -3,7 +3,16 @@
 from hypothesis import given, strategies as st, assume
 import pytest
 
-from agents.cost import calculate_cost, MODEL_COSTS
+import numpy as np
+
+from agents.cost import (
+    calculate_cost,
+    estimate_tokens,
+    estimate_tokens_batch,
+    bulk_calculate_cost,
+    encode_models,
+    MODEL_COSTS,
+)
 
 
 @given(
@@ -259,10 +268,65 @@ def test_unknown_model_fallback(input_tokens, output_tokens, model):
 
     Ensures graceful degradation
     """
+    # Only genuinely unknown ids; known names may appear with or without a provider prefix
+    known = set(MODEL_COSTS) | {name.rsplit("/", 1)[-1] for name in MODEL_COSTS}
+    assume(model not in known and model.rsplit("/", 1)[-1] not in known)
+
     # Should not raise an exception for unknown models
     cost = calculate_cost(input_tokens, output_tokens, model)
     assert cost >= 0
 
     # Should be same as gpt-3.5-turbo pricing
     default_cost = calculate_cost(input_tokens, output_tokens, "gpt-3.5-turbo")
-    assert cost == default_cost
\ No newline at end of file
+    assert cost == default_cost
+
+@given(
+    input_tokens=st.integers(min_value=0, max_value=1000),
+    output_tokens=st.integers(min_value=0, max_value=1000),
+    model=st.sampled_from([name for name in MODEL_COSTS if "/" in name])
+)
+def test_provider_prefixed_model_uses_own_rates(input_tokens, output_tokens, model):
+    """
+    Property: Provider-prefixed catalog entries are priced with their own rates
+
+    Guards against stripping the prefix before the lookup
+    """
+    rates = MODEL_COSTS[model]
+    expected = (input_tokens / 1000) * rates["input_per_1k"] + (output_tokens / 1000) * rates["output_per_1k"]
+
+    assert abs(calculate_cost(input_tokens, output_tokens, model) - expected) < 1e-6
+
+
+@given(texts=st.lists(st.text(max_size=200), max_size=20))
+def test_estimate_tokens_batch_matches_single(texts):
+    """
+    Property: Batch estimation agrees with per-string estimation
+
+    Keeps the vectorised path in lockstep with the scalar heuristic
+    """
+    assert estimate_tokens_batch(texts) == [estimate_tokens(text) for text in texts]
+
+
+@given(
+    rows=st.lists(
+        st.tuples(
+            st.integers(min_value=0, max_value=1000000),
+            st.integers(min_value=0, max_value=100000),
+            st.sampled_from(list(MODEL_COSTS.keys()) + ["gpt-4o-mini", "unknown/model"]),
+        ),
+        max_size=50,
+    )
+)
+def test_bulk_calculate_cost_matches_per_row(rows):
+    """
+    Property: Vectorised backfill prices every row like calculate_cost
+    """
+    prompt = np.array([r[0] for r in rows], dtype=np.int64)
+    completion = np.array([r[1] for r in rows], dtype=np.int64)
+
+    costs = bulk_calculate_cost(prompt, completion, encode_models(r[2] for r in rows))
+
+    expected = [calculate_cost(*row) for row in rows]
+    # np.round and round() may settle a half-microcent tie differently
+    assert costs.tolist() == pytest.approx(expected, abs=1.5e-6)
+
@@ -0,0 +1,126 @@
+"""Unit tests for model catalog loading and refresh in the app module."""
+
+from concurrent.futures import Future
+from datetime import datetime, timezone
+
+import pytest
+
+import app
+from agents.models import AgentConfig
+from services.catalog import FALLBACK_MODELS
+
+
+class TestLoadInitialModels:
+    """Test suite for load_initial_models."""
+
+    def test_failed_lookup_uses_fallback_catalog_without_retrying(self, mocker) -> None:
+        """Test a failing catalog lookup is not repeated and the bundled models are used."""
+        get_models = mocker.patch.object(app, "get_models", side_effect=RuntimeError("boom"))
+
+        choices, label, models, source = app.load_initial_models()
+
+        get_models.assert_called_once_with()
+        assert models == FALLBACK_MODELS
+        assert source == "fallback"
+        assert label == "Fallback"
+        assert choices == [(f"{m.display_name} ({m.provider})", m.id) for m in FALLBACK_MODELS]
+
+
+    def test_initial_catalog_is_loaded_lazily_once(self, mocker) -> None:
+        """Test the startup catalog is fetched on first use and then reused."""
+        app._initial_model_catalog.cache_clear()
+        catalog = ([("GPT-4 Turbo (openai)", "openai/gpt-4-turbo")], "Fallback", [], "fallback")
+        load = mocker.patch.object(app, "load_initial_models", return_value=catalog)
+
+        try:
+            assert app._initial_model_catalog() == catalog
+            assert app._initial_model_catalog() == catalog
+            load.assert_called_once_with()
+        finally:
+            app._initial_model_catalog.cache_clear()
+
+class TestPrefetchInitialModels:
+    """Test suite for the background startup catalog load."""
+
+    @pytest.fixture(autouse=True)
+    def reset_prefetch(self, mocker):
+        mocker.patch.object(app, "_initial_catalog_future", None)
+
+    def test_prefetch_starts_one_background_load(self, mocker) -> None:
+        """Test repeated prefetches share the first load."""
+        catalog = app._fallback_catalog()
+        load = mocker.patch.object(app, "_initial_model_catalog", return_value=catalog)
+
+        future = app.prefetch_initial_models()
+
+        assert app.prefetch_initial_models() is future
+        assert future.result(timeout=5) == catalog
+        load.assert_called_once_with()
+
+    def test_hydrate_applies_prefetched_catalog(self, mocker) -> None:
+        """Test the page-load handler swaps the fallback options for the fetched catalog."""
+        fetched = datetime(2024, 5, 1, 9, 30, tzinfo=timezone.utc)
+        fallback_choices = app._fallback_catalog()[0]
+        choices = [fallback_choices[0], ("Llama 3 70B (meta)", "meta-llama/llama-3-70b")]
+        future = Future()
+        future.set_result((choices, app._catalog_source_label("dynamic", fetched), [], "dynamic"))
+        mocker.patch.object(app, "_initial_catalog_future", future)
+        config = AgentConfig(name="Agent", model=fallback_choices[0][1], system_prompt="Be brief.")
+
+        updated_choices, source_label, source_enum, dropdown_update, _, updated_config, _, id_mapping = (
+            app.hydrate_models_handler(fallback_choices[0][0], config, fallback_choices)
+        )
+
+        assert updated_choices == choices
+        assert (source_label, source_enum) == ("Dynamic (fetched 09:30)", "dynamic")
+        assert dropdown_update["choices"] == [label for label, _ in choices]
+        assert dropdown_update["value"] == fallback_choices[0][0]
+        assert updated_config is config
+        assert id_mapping == dict(choices)
+
+
+class TestRefreshModelsHandler:
+    """Test suite for refresh_models_handler."""
+
+    @pytest.fixture
+    def config(self) -> AgentConfig:
+        return AgentConfig(name="Agent", model="openai/gpt-4-turbo", system_prompt="Be brief.")
+
+    def test_unchanged_catalog_skips_dropdown_choices(self, mocker, config) -> None:
+        """Test a no-op refresh only updates the selection and keeps the config object."""
+        mocker.patch.object(app, "get_models", return_value=(list(FALLBACK_MODELS), "fallback", None))
+        existing = [(f"{m.display_name} ({m.provider})", m.id) for m in FALLBACK_MODELS]
+
+        choices, _, _, dropdown_update, _, updated_config, _, id_mapping = app.refresh_models_handler(
+            existing[0][0], config, existing
+        )
+
+        assert choices is existing
+        assert "choices" not in dropdown_update
+        assert dropdown_update["value"] == existing[0][0]
+        assert updated_config is config
+        assert id_mapping == dict(existing)
+
+    def test_changed_catalog_sends_new_choices(self, mocker, config) -> None:
+        """Test a refresh that changes the catalog re-sends the options and updates the model."""
+        mocker.patch.object(app, "get_models", return_value=(FALLBACK_MODELS[1:], "fallback", None))
+        existing = [(f"{m.display_name} ({m.provider})", m.id) for m in FALLBACK_MODELS]
+
+        choices, _, _, dropdown_update, _, updated_config, _, _ = app.refresh_models_handler(
+            "Claude 3 Opus (anthropic)", config, existing
+        )
+
+        assert choices == existing[1:]
+        assert dropdown_update["choices"] == [label for label, _ in existing[1:]]
+        assert updated_config.model == "anthropic/claude-3-opus"
+        assert config.model == "openai/gpt-4-turbo"
+
+    def test_dynamic_source_label_uses_catalog_utc_time(self, mocker, config) -> None:
+        """Test a dynamic catalog is labelled with its UTC fetch time."""
+        fetched = datetime(2024, 5, 1, 13, 45, 9, tzinfo=timezone.utc)
+        mocker.patch.object(app, "get_models", return_value=(list(FALLBACK_MODELS), "dynamic", fetched))
+
+        _, source_label, source_enum, *_ = app.refresh_models_handler("", config, None)
+
+        assert source_enum == "dynamic"
+        assert source_label == "Dynamic (fetched 13:45)"
@@ -0,0 +1,48 @@
+"""Unit tests for the parameter optimization handlers in the app module."""
+
+import pytest
+
+import app
+
+
+class TestSmartDefaultsHandler:
+    """Test suite for smart_defaults_handler."""
+
+    @pytest.mark.asyncio
+    async def test_recommendations_update_sets_value_and_visibility(self, mocker) -> None:
+        """Test the recommendations panel gets its value and visibility in one update."""
+        response = mocker.Mock(reasoning="General purpose defaults", confidence_score=0.8)
+        response.default_parameters = mocker.Mock(temperature=0.7, top_p=0.9, max_tokens=1024)
+        mocker.patch.object(app, "get_smart_defaults", mocker.AsyncMock(return_value=response))
+
+        status, update = await app.smart_defaults_handler("GPT-4 Turbo (openai)", {})
+
+        assert status.startswith("✅ Smart defaults applied")
+        assert update["visible"] is True
+        assert update["value"]["recommended_temperature"] == 0.7
+        assert update["value"]["recommended_top_p"] == 0.9
+
+    @pytest.mark.asyncio
+    async def test_failure_hides_and_clears_recommendations(self, mocker) -> None:
+        """Test a failed lookup clears the panel and hides it."""
+        mocker.patch.object(app, "get_smart_defaults", mocker.AsyncMock(side_effect=RuntimeError("boom")))
+
+        status, update = await app.smart_defaults_handler("GPT-4 Turbo (openai)", {})
+
+        assert status == "❌ Smart defaults failed: boom"
+        assert update == {"__type__": "update", "value": {}, "visible": False}
+
+
+class TestOptimizeParametersHandler:
+    """Test suite for optimize_parameters_handler."""
+
+    @pytest.mark.asyncio
+    async def test_missing_task_hides_recommendations(self, mocker) -> None:
+        """Test an empty task description is rejected without calling the optimizer."""
+        optimize = mocker.patch.object(app, "optimize_parameters", mocker.AsyncMock())
+
+        status, update = await app.optimize_parameters_handler("  ", "GPT-4 Turbo (openai)", "", 0.7, 1.0, {})
+
+        optimize.assert_not_called()
+        assert status == "❌ Please describe your task first"
+        assert update == {"__type__": "update", "value": {}, "visible": False}
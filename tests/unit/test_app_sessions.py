@@ -0,0 +1,55 @@
+"""Unit tests for the session save and load handlers in the app module."""
+
+from datetime import datetime, timezone
+
+import app
+from agents.models import AgentConfig, Session
+
+
+class TestSaveSessionHandler:
+    """Test suite for save_session_handler."""
+
+    def test_transcript_messages_share_one_timestamp(self, mocker, tmp_path) -> None:
+        """Test every message in a saved transcript is stamped with the same save time."""
+        save_session = mocker.patch.object(app, "save_session", return_value=tmp_path / "chat.json")
+        mocker.patch.object(app, "list_sessions", return_value=[("chat.json", tmp_path / "chat.json")])
+        config = AgentConfig(name="Agent", model="openai/gpt-4", system_prompt="Be brief.")
+        history = [["Hi", "Hello"], ["Bye", "Goodbye"]]
+
+        session, status, _, _ = app.save_session_handler("chat", config, history, None)
+
+        saved = save_session.call_args.args[0]
+        assert status == "✅ Saved: chat.json"
+        assert [(m["role"], m["content"]) for m in saved.transcript] == [
+            ("user", "Hi"), ("assistant", "Hello"), ("user", "Bye"), ("assistant", "Goodbye")
+        ]
+        assert {m["ts"] for m in saved.transcript} == {session.created_at.isoformat()}
+
+
+class TestLoadSessionHandler:
+    """Test suite for load_session_handler."""
+
+    def test_history_is_rebuilt_from_message_pairs(self, mocker, tmp_path) -> None:
+        """Test messages are paired in order and a trailing unpaired message is dropped."""
+        config = AgentConfig(name="Agent", model="openai/gpt-4", system_prompt="Be brief.")
+        session = Session(
+            id="s1",
+            created_at=datetime(2024, 5, 1, tzinfo=timezone.utc),
+            agent_config=config,
+            transcript=[
+                {"role": "user", "content": "Hi"},
+                {"role": "assistant", "content": "Hello"},
+                {"role": "user", "content": "Bye"},
+                {"role": "assistant", "content": "Goodbye"},
+                {"role": "user", "content": "Unanswered"},
+            ],
+            model_id=config.model,
+        )
+        mocker.patch.object(app, "list_sessions", return_value=[("chat.json", tmp_path / "chat.json")])
+        mocker.patch.object(app, "load_session", return_value=session)
+
+        result = app.load_session_handler("chat.json", {"GPT-4 (openai)": "openai/gpt-4"})
+
+        assert result[1] == "✅ Loaded: chat.json"
+        assert result[2] == [["Hi", "Hello"], ["Bye", "Goodbye"]]
+        assert result[5] == "GPT-4 (openai)"
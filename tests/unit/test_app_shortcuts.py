@@ -0,0 +1,28 @@
+"""Unit tests for keyboard shortcut dispatch in the app module."""
+
+import pytest
+
+import app
+
+
+class TestHandleKeyboardShortcut:
+    """Test suite for handle_keyboard_shortcut."""
+
+    @pytest.mark.parametrize(
+        ("event_data", "expected"),
+        [
+            ({"key": "Escape", "ctrlKey": True, "altKey": True}, "stop_generation"),
+            ({"key": "h", "ctrlKey": True, "shiftKey": True}, "show_help"),
+            ({"key": "h", "ctrlKey": True}, "none"),
+            ({"key": "S", "metaKey": True, "shiftKey": True}, "save_session"),
+            ({"key": "3", "ctrlKey": True, "altKey": True}, "focus_sessions_tab"),
+            ({"key": "k", "altKey": True}, "none"),
+        ],
+    )
+    def test_shortcut_precedence(self, mocker, event_data, expected) -> None:
+        """Test escape wins over modifiers and Alt shortcuts still apply with Ctrl held."""
+        assert app.handle_keyboard_shortcut(mocker.Mock(_data=event_data)) == expected
+
+    def test_malformed_event_is_ignored(self, mocker) -> None:
+        """Test an event without usable data maps to no action."""
+        assert app.handle_keyboard_shortcut(mocker.Mock(_data=None)) == "none"
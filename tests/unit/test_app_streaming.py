@@ -0,0 +1,488 @@
+"""Unit tests for partial-response rendering in the streaming chat handler."""
+
+import asyncio
+import copy
+import inspect
+
+import pytest
+
+import app
+from agents.models import AgentConfig
+from agents.runtime import StreamCancelEvent, StreamResult
+
+
+async def _collect(generator) -> list[tuple]:
+    # Gradio serialises each frame before pulling the next one, and partial
+    # frames reuse one history list, so snapshot the chat history per frame
+    return [(copy.deepcopy(update[0]), *update[1:]) async for update in generator]
+
+
+@pytest.fixture(autouse=True)
+def reset_run_writer_state(mocker):
+    """Keep a failed write in one test from leaking into the next test's status."""
+    mocker.patch.object(app, "_run_writer_failed", False)
+
+
+class TestStreamingRender:
+    """Test suite for throttled partial renders in send_message_streaming_fixed."""
+
+    @pytest.fixture
+    def config(self) -> AgentConfig:
+        return AgentConfig(name="Agent", model="openai/gpt-4", system_prompt="Be brief.")
+
+    @pytest.fixture(autouse=True)
+    def stub_persistence(self, mocker):
+        mocker.patch.object(app, "get_agent", return_value=mocker.Mock())
+        return mocker.patch.object(app, "append_runs")
+
+    def _run(self, config: AgentConfig):
+        return app.send_message_streaming_fixed(
+            message="Hello",
+            history=[],
+            config_state=config,
+            model_source_enum="fallback",
+            agent_state=None,
+            cancel_event_state=None,
+            is_generating_state=False,
+            experiment_id="",
+            task_label="",
+            run_notes="",
+            id_mapping={},
+        )
+
+    @pytest.mark.asyncio
+    async def test_partial_text_is_rendered_in_batches(self, mocker, config) -> None:
+        """Test bursts of deltas are rendered together rather than one update per token."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 0.02)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            for burst in (["He", "llo"], [" wor", "ld"]):
+                for delta in burst:
+                    on_delta(delta)
+                await asyncio.sleep(0.05)
+            return StreamResult("Hello world", {"prompt_tokens": 1}, 100, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await _collect(self._run(config))
+
+        partial_histories = [update[0] for update in updates[1:-1]]
+        assert partial_histories == [[["Hello", "Hello"]], [["Hello", "Hello world"]]]
+        assert updates[-1][0] == [["Hello", "Hello world"]]
+        assert updates[-1][2] == "Response generated"
+
+    @pytest.mark.asyncio
+    async def test_idle_stream_does_not_wake_render_loop(self, mocker, config) -> None:
+        """Test a pause between deltas doesn't poll; each frame waits on the next delta."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 0.01)
+
+        async def slow_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            await asyncio.sleep(0.3)
+            on_delta("!")
+            await asyncio.sleep(0.05)
+            return StreamResult("Hi!", None, 350, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=slow_stream)
+        wait = mocker.spy(app.asyncio, "wait")
+
+        updates = await _collect(self._run(config))
+
+        assert [update[0] for update in updates[1:-1]] == [[["Hello", "Hi"]], [["Hello", "Hi!"]]]
+        # Two waits per rendered frame plus the final wake-up, not one per 10 ms tick
+        assert wait.call_count <= 6
+
+    @pytest.mark.asyncio
+    async def test_first_delta_renders_immediately_and_later_ones_are_paced(self, mocker, config) -> None:
+        """Test the interval is measured from the previous render, not from each frame's first delta."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 10)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            await asyncio.sleep(0.05)
+            on_delta(" there")
+            await asyncio.sleep(0.05)
+            return StreamResult("", None, 100, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await asyncio.wait_for(_collect(self._run(config)), timeout=2)
+
+        assert [update[0] for update in updates[1:-1]] == [[["Hello", "Hi"]]]
+        assert updates[-1][0] == [["Hello", "Hi there"]]
+
+    @pytest.mark.asyncio
+    async def test_partial_renders_copy_history_once_and_leave_state_alone(self, mocker, config) -> None:
+        """Test partial frames share one display list and the input history is only extended at the end."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 0.01)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            for delta in ("Hi", " there"):
+                on_delta(delta)
+                await asyncio.sleep(0.05)
+            return StreamResult("", None, 100, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+        history = [["Earlier", "Reply"]]
+        generator = app.send_message_streaming_fixed(
+            "Hello", history, config, "fallback", None, None, False, "", "", "", {}
+        )
+
+        await generator.__anext__()  # initial "Generating response..." state
+        first = (await generator.__anext__())[0]
+        second = (await generator.__anext__())[0]
+        assert history == [["Earlier", "Reply"]]
+        final = [update async for update in generator][-1]
+
+        assert second is first
+        assert first == [["Earlier", "Reply"], ["Hello", "Hi there"]]
+        assert final[1] == [["Earlier", "Reply"], ["Hello", "Hi there"]]
+
+    @pytest.mark.asyncio
+    async def test_closing_generator_cancels_stream(self, mocker, config) -> None:
+        """Test the background stream task is cancelled when the UI stops consuming."""
+        cancelled = asyncio.Event()
+
+        async def endless_stream(agent, message, on_delta, cancel_token, **kwargs):
+            try:
+                while True:
+                    on_delta("x")
+                    await asyncio.sleep(0.01)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=endless_stream)
+        generator = self._run(config)
+
+        await generator.__anext__()  # initial "Generating response..." state
+        await generator.__anext__()  # first partial render
+        await generator.aclose()
+
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    @pytest.mark.asyncio
+    async def test_aborted_stream_keeps_unrendered_deltas(self, mocker, config) -> None:
+        """Test deltas queued after the last render still reach the partial response."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 10)
+
+        async def aborted_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hel")
+            on_delta("lo")
+            return StreamResult("", None, 5, True)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=aborted_stream)
+
+        updates = await _collect(self._run(config))
+
+        assert updates[-1][0] == [["Hello", "Hello"]]
+        assert updates[-1][2] == "Generation cancelled. Partial response: 5 characters."
+
+    @pytest.mark.asyncio
+    async def test_run_record_is_written_in_background(self, mocker, config, stub_persistence) -> None:
+        """Test the final render doesn't wait on the CSV write and the record is flushed later."""
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            return StreamResult("Hi", {"prompt_tokens": 2, "completion_tokens": 1}, 10, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await _collect(self._run(config))
+        assert updates[-1][2] == "Response generated"
+
+        await app.flush_run_queue()
+
+        (records,), _ = stub_persistence.call_args
+        assert [(r.agent_name, r.prompt_tokens, r.completion_tokens) for r in records] == [("Agent", 2, 1)]
+
+
+    @pytest.mark.asyncio
+    async def test_final_text_comes_from_forwarded_deltas(self, mocker, config) -> None:
+        """Test the handler builds the reply from its own deltas and doesn't ask the runtime to collect."""
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            for delta in ("Hel", "lo", "!"):
+                on_delta(delta)
+            return StreamResult("", None, 5, False)
+
+        run_stream = mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await _collect(self._run(config))
+
+        assert updates[-1][0] == [["Hello", "Hello!"]]
+        assert run_stream.call_args.kwargs["collect"] is False
+
+    @pytest.mark.asyncio
+    async def test_status_reports_failing_run_writer(self, mocker, config) -> None:
+        """Test a failed background write is surfaced on the next reply without error details."""
+        mocker.patch.object(app, "_run_writer_failed", True)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            return StreamResult("", None, 1, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await _collect(self._run(config))
+
+        assert updates[-1][2] == "Response generated (run telemetry is not being saved; see server logs)"
+
+    @pytest.mark.asyncio
+    async def test_history_state_is_written_only_by_final_frame(self, mocker, config) -> None:
+        """Test the second output (history_state) is left untouched until the reply completes."""
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 0.01)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            await asyncio.sleep(0.05)
+            return StreamResult("", None, 50, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        updates = await _collect(self._run(config))
+
+        assert len(updates) == 3
+        assert all(update[1] == {"__type__": "update"} for update in updates[:-1])
+        assert updates[-1][1] == [["Hello", "Hi"]]
+
+class TestStreamingOutputs:
+    """Test the handler's frames line up with the send button's declared outputs."""
+
+    @pytest.fixture
+    def send_event(self, mocker):
+        mocker.patch.object(app, "_initial_catalog_future", None)
+        mocker.patch.object(app, "_initial_model_catalog", return_value=app._fallback_catalog())
+        demo = app.create_ui()
+        return next(fn for fn in demo.fns.values() if fn.fn is app.send_message_streaming_fixed)
+
+    @pytest.fixture
+    def config(self) -> AgentConfig:
+        return AgentConfig(name="Agent", model="openai/gpt-4", system_prompt="Be brief.")
+
+    def _run(self, config: AgentConfig, message: str = "Hello"):
+        return app.send_message_streaming_fixed(
+            message=message,
+            history=[],
+            config_state=config,
+            model_source_enum="fallback",
+            agent_state=None,
+            cancel_event_state=None,
+            is_generating_state=False,
+            experiment_id="",
+            task_label="",
+            run_notes="",
+            id_mapping={},
+        )
+
+    def _outputs_by_position(self, send_event) -> list[str]:
+        """Name each output by matching it to a handler input or its elem_id."""
+        params = inspect.signature(app.send_message_streaming_fixed).parameters
+        inputs = dict(zip(params, send_event.inputs))
+        names = []
+        for block in send_event.outputs:
+            name = next((param for param, inp in inputs.items() if inp is block), None)
+            names.append(name or block.elem_id)
+        return names
+
+    def test_send_button_outputs_layout(self, send_event) -> None:
+        """Test the wiring the handler's tuple positions are written against."""
+        assert self._outputs_by_position(send_event) == [
+            "conversation-chatbot",
+            "history",
+            "run-info",
+            "cancel_event_state",
+            "is_generating_state",
+            "send-btn",
+            "stop-btn",
+        ]
+
+    @pytest.mark.asyncio
+    async def test_every_frame_matches_outputs(self, mocker, send_event, config) -> None:
+        """Test streaming, final and early-exit frames all fill each output with its own value."""
+        mocker.patch.object(app, "get_agent", return_value=mocker.Mock())
+        mocker.patch.object(app, "append_runs")
+        mocker.patch.object(app, "STREAM_RENDER_INTERVAL_S", 0)
+
+        async def fake_stream(agent, message, on_delta, cancel_token, **kwargs):
+            on_delta("Hi")
+            await asyncio.sleep(0.01)
+            return StreamResult("", None, 5, False)
+
+        mocker.patch.object(app, "run_agent_stream", side_effect=fake_stream)
+
+        *streaming, final = await _collect(self._run(config))
+        early_exit = await _collect(self._run(config, message="   "))
+
+        assert len(streaming) == 2
+        for frame in [*streaming, final, *early_exit]:
+            assert len(frame) == len(send_event.outputs)
+        for frame in streaming:
+            assert isinstance(frame[3], StreamCancelEvent)
+            assert frame[4:] == (True, app._SEND_DISABLED, app._STOP_VISIBLE)
+        assert final[1] == [["Hello", "Hi"]]
+        assert final[3:] == (None, False, app._SEND_IDLE, app._STOP_HIDDEN)
+        assert early_exit[0][3:] == (None, False, app._SEND_IDLE, app._STOP_HIDDEN)
+
+    @pytest.mark.asyncio
+    async def test_stop_handler_interrupts_stalled_stream(self, mocker, config) -> None:
+        """Test the cancel event yielded to cancel_event_state lets stop_generation end a stalled read."""
+        class Chunk:
+            def __init__(self, delta):
+                self.delta = delta
+
+        async def stalled_stream():
+            yield Chunk("Hel")
+            await asyncio.sleep(3600)
+            yield Chunk("never")  # pragma: no cover
+
+        agent = mocker.Mock()
+        agent.run.return_value = stalled_stream()
+        mocker.patch.object(app, "get_agent", return_value=agent)
+        mocker.patch.object(app, "append_runs")
+        generator = self._run(config)
+
+        await generator.__anext__()  # initial "Generating response..." state
+        partial = await generator.__anext__()  # "Hel", then the read stalls
+        # Gradio runs the synchronous stop handler on a worker thread
+        stop = await asyncio.to_thread(app.stop_generation, partial[3], partial[4])
+        rest = await asyncio.wait_for(_collect(generator), timeout=5)
+
+        assert stop[0] == "⏹️ Stopping..."
+        assert rest[-1][0] == [["Hello", "Hel"]]
+        assert rest[-1][2] == "Generation cancelled. Partial response: 3 characters."
+
+
+class TestRunWriter:
+    """Test suite for the batched background run-record writer."""
+
+    @pytest.mark.asyncio
+    async def test_queued_records_are_written_as_one_batch(self, mocker) -> None:
+        """Test records queued before the writer runs are appended in a single call."""
+        append_runs = mocker.patch.object(app, "append_runs")
+        records = [mocker.Mock(name=f"record{i}") for i in range(3)]
+
+        for record in records:
+            app._enqueue_run(record)
+        await app.flush_run_queue()
+
+        append_runs.assert_called_once_with(records)
+
+    @pytest.mark.asyncio
+    async def test_write_failures_are_logged_and_writer_keeps_running(self, mocker) -> None:
+        """Test a failed batch is logged and later records are still written."""
+        append_runs = mocker.patch.object(app, "append_runs", side_effect=[RuntimeError("disk full"), None])
+        warning = mocker.patch.object(app.logger, "warning")
+
+        app._enqueue_run("first")
+        await app.flush_run_queue()
+        assert app._run_writer_failed is True
+
+        app._enqueue_run("second")
+        await app.flush_run_queue()
+
+        assert append_runs.call_args_list == [mocker.call(["first"]), mocker.call(["second"])]
+        warning.assert_called_once()
+        assert app._run_writer_failed is False
+
+
+    def test_records_left_on_a_finished_loop_are_carried_over(self, mocker) -> None:
+        """Test records the previous loop's writer never wrote move to the new writer."""
+        mocker.patch.object(app, "_run_queue", None)
+        mocker.patch.object(app, "_run_writer_task", None)
+        append_runs = mocker.patch.object(app, "append_runs")
+
+        async def enqueue_only() -> None:
+            app._enqueue_run("first")
+            app._run_writer_task.cancel()  # the writer goes away with its loop before running
+
+        async def enqueue_and_flush() -> None:
+            app._enqueue_run("second")
+            await app.flush_run_queue()
+
+        asyncio.run(enqueue_only())
+        append_runs.assert_not_called()
+        asyncio.run(enqueue_and_flush())
+
+        append_runs.assert_called_once_with(["first", "second"])
+
+    def test_flush_writes_records_stranded_by_a_finished_loop(self, mocker) -> None:
+        """Test a shutdown flush on a new loop still writes records queued on the old one."""
+        mocker.patch.object(app, "_run_queue", None)
+        mocker.patch.object(app, "_run_writer_task", None)
+        append_runs = mocker.patch.object(app, "append_runs")
+
+        async def enqueue_only() -> None:
+            app._enqueue_run("first")
+            app._run_writer_task.cancel()
+
+        asyncio.run(enqueue_only())
+        asyncio.run(app.flush_run_queue())
+
+        append_runs.assert_called_once_with(["first"])
+
+
+class TestServerLifespan:
+    """Test suite for the server shutdown hook."""
+
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_fetch_client(self, mocker) -> None:
+        """Test the pooled web-fetch client is closed when the server stops."""
+        aclose = mocker.patch.object(app, "aclose_http_client", mocker.AsyncMock())
+
+        async with app.server_lifespan(None):
+            aclose.assert_not_called()
+
+        aclose.assert_awaited_once_with()
+
+    @pytest.mark.asyncio
+    async def test_shutdown_writes_queued_run_records(self, mocker) -> None:
+        """Test run records still queued at shutdown are written before the server stops."""
+        mocker.patch.object(app, "aclose_http_client", mocker.AsyncMock())
+        append_runs = mocker.patch.object(app, "append_runs")
+
+        async with app.server_lifespan(None):
+            app._enqueue_run("pending")
+
+        append_runs.assert_called_once_with(["pending"])
+
+
+class TestUsageCounts:
+    """Test suite for converting provider usage into token counts."""
+
+    @pytest.mark.parametrize("usage", [None, {}])
+    def test_missing_usage_skips_key_lookups(self, mocker, usage) -> None:
+        """Test an absent usage payload yields zero counts without probing keys."""
+        usage_int = mocker.patch.object(app, "_usage_int")
+
+        assert app._usage_counts(usage) == (0, 0, 0)
+        usage_int.assert_not_called()
+
+    def test_provider_specific_keys_are_used(self) -> None:
+        """Test counts are read from whichever key the provider reports."""
+        usage = {"input_tokens": 12, "output_tokens": "5", "total_tokens": 17}
+
+        assert app._usage_counts(usage) == (12, 5, 17)
+
+
+class TestStreamRenderInterval:
+    """Test suite for configuring the partial render interval."""
+
+    def test_default_interval_without_env(self, monkeypatch) -> None:
+        """Test renders are paced at about 30 Hz unless configured."""
+        monkeypatch.delenv("UI_FLUSH_MS", raising=False)
+
+        assert app._stream_render_interval() == pytest.approx(1 / 30)
+
+    def test_interval_is_read_in_milliseconds(self, monkeypatch) -> None:
+        """Test UI_FLUSH_MS sets the interval in milliseconds."""
+        monkeypatch.setenv("UI_FLUSH_MS", "50")
+
+        assert app._stream_render_interval() == pytest.approx(0.05)
+
+    @pytest.mark.parametrize("value", ["fast", "-5", "nan", "inf"])
+    def test_invalid_values_fall_back_to_default(self, mocker, monkeypatch, value) -> None:
+        """Test unusable values are logged and ignored."""
+        monkeypatch.setenv("UI_FLUSH_MS", value)
+        warning = mocker.patch.object(app.logger, "warning")
+
+        assert app._stream_render_interval() == pytest.approx(1 / 30)
+        warning.assert_called_once()
@@ -0,0 +1,37 @@
+"""Unit tests for run telemetry helpers in the app module."""
+
+import pytest
+
+from app import (
+    _COMPLETION_TOKEN_KEYS,
+    _PROMPT_TOKEN_KEYS,
+    _TOTAL_TOKEN_KEYS,
+    _usage_int,
+)
+
+
+class TestUsageInt:
+    """Test suite for extracting token counts from provider usage payloads."""
+
+    @pytest.mark.parametrize(
+        ("usage", "expected"),
+        [
+            ({"prompt_tokens": 12}, 12),
+            ({"input_tokens": 7}, 7),
+            ({"request_tokens": "5"}, 5),
+            ({"prompt_tokens": None, "input_tokens": 3}, 3),
+            ({"prompt_tokens": 1, "input_tokens": 9}, 1),
+            ({}, 0),
+            ({"prompt_tokens": "n/a"}, 0),
+        ],
+    )
+    def test_prompt_tokens_resolve_across_key_variants(self, usage, expected) -> None:
+        """Test the first non-null prompt key wins and bad values fall back to zero."""
+        assert _usage_int(usage, _PROMPT_TOKEN_KEYS) == expected
+
+    def test_completion_and_total_keys(self) -> None:
+        """Test completion and total counts use their own key sets."""
+        usage = {"output_tokens": 4, "total_tokens": 10}
+
+        assert _usage_int(usage, _COMPLETION_TOKEN_KEYS) == 4
+        assert _usage_int(usage, _TOTAL_TOKEN_KEYS) == 10
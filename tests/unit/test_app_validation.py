@@ -0,0 +1,75 @@
+"""Unit tests for the inline form field validators in the app module."""
+
+import pytest
+
+import app
+
+
+@pytest.fixture(autouse=True)
+def clear_validator_caches():
+    """Keep cached results from one test out of the next."""
+    validators = (app.validate_agent_name, app.validate_system_prompt, app.validate_temperature, app.validate_top_p)
+    for validator in validators:
+        validator.cache_clear()
+    yield
+    for validator in validators:
+        validator.cache_clear()
+
+
+class TestFieldValidatorCache:
+    """Test suite for memoized field validators."""
+
+    def test_repeated_value_is_validated_once(self, mocker) -> None:
+        """Test a repeated input is answered from the cache."""
+        robust = mocker.patch("agents.tools.validate_temperature_robust", return_value={"is_valid": True})
+
+        first = app.validate_temperature(0.7)
+        second = app.validate_temperature(0.7)
+
+        robust.assert_called_once_with(0.7)
+        assert first == second == {"status": "success", "message": "✅ Temperature is valid", "is_valid": True}
+
+    def test_returned_dicts_are_independent_copies(self) -> None:
+        """Test mutating a returned result doesn't change later results."""
+        app.validate_top_p(0.5)["is_valid"] = False
+
+        assert app.validate_top_p(0.5)["is_valid"] is True
+
+    def test_equal_values_of_different_types_are_cached_separately(self, mocker) -> None:
+        """Test inputs such as 1 and 1.0 don't share a cache entry."""
+        robust = mocker.patch("agents.tools.validate_temperature_robust", return_value={"is_valid": True})
+
+        app.validate_temperature(1)
+        app.validate_temperature(1.0)
+
+        assert robust.call_args_list == [mocker.call(1), mocker.call(1.0)]
+
+    def test_unhashable_value_is_validated_without_caching(self) -> None:
+        """Test unhashable input still gets a validation result."""
+        result = app.validate_top_p([0.5])
+
+        assert result["is_valid"] is False
+        assert "Must be a number" in result["message"]
+
+
+class TestValidateFormField:
+    """Test suite for the form field validation dispatcher."""
+
+    @pytest.mark.parametrize(
+        ("field_name", "value"),
+        [("agent_name", "Agent"), ("system_prompt", "Be brief."), ("temperature", 0.7), ("top_p", 0.9)],
+    )
+    def test_known_fields_use_their_validator(self, field_name, value) -> None:
+        """Test each single-value field is routed to its validator."""
+        assert app.validate_form_field(field_name, value) == app._FIELD_VALIDATORS[field_name](value)
+
+    def test_model_field_checks_available_models(self, mocker) -> None:
+        """Test the model field is validated against the catalog."""
+        models = [mocker.Mock(id="openai/gpt-4-turbo")]
+
+        assert app.validate_form_field("model", "openai/gpt-4-turbo", models)["is_valid"] is True
+        assert app.validate_form_field("model", "unknown/model", models)["is_valid"] is False
+
+    def test_unknown_field_is_accepted(self) -> None:
+        """Test fields without a validator are reported as unknown."""
+        assert app.validate_form_field("notes", "anything") == {"status": "unknown", "message": "", "is_valid": True}
@@ -0,0 +1,95 @@
+"""Unit tests for the in-process response cache."""
+
+import pytest
+
+import agents.cache
+from agents.cache import (
+    clear_response_cache,
+    get_cached_response,
+    make_cache_key,
+    normalize_message,
+    store_response,
+)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Start and finish every test with an empty response cache."""
+    clear_response_cache()
+    yield
+    clear_response_cache()
+
+
+class TestNormalizeMessage:
+    """Test suite for normalize_message."""
+
+    @pytest.mark.parametrize(
+        "message",
+        ["What is 6 x 7?", "what is 6 x 7", "  WHAT is\t6 x 7 ?! ", "Ｗhat is 6 x 7."],
+    )
+    def test_trivial_rewordings_fold_together(self, message) -> None:
+        """Test that case, width, spacing and trailing punctuation are ignored."""
+        assert normalize_message(message) == "what is 6 x 7"
+
+    def test_inner_punctuation_is_preserved(self) -> None:
+        """Test that only trailing punctuation is dropped."""
+        assert normalize_message("Is 3.5 > 3?") == "is 3.5 > 3"
+
+
+class TestMakeCacheKey:
+    """Test suite for make_cache_key."""
+
+    def test_key_is_stable_for_identical_inputs(self) -> None:
+        """Test that identical requests hash to the same key."""
+        first = make_cache_key("openai/gpt-4", "Be terse.", 0.0, 1.0, "Hi")
+        second = make_cache_key("openai/gpt-4", "Be terse.", 0.0, 1.0, "Hi")
+
+        assert first == second
+        assert len(first) == 32
+
+    @pytest.mark.parametrize(
+        "changed",
+        [
+            ("openai/gpt-3.5-turbo", "Be terse.", 0.0, 1.0, "Hi"),
+            ("openai/gpt-4", "Be verbose.", 0.0, 1.0, "Hi"),
+            ("openai/gpt-4", "Be terse.", 0.0, 0.9, "Hi"),
+            ("openai/gpt-4", "Be terse.", 0.0, 1.0, "Hello"),
+            ("openai/gpt-4", "Be terse.", 0.0, 1.0, "Hi", True),
+        ],
+    )
+    def test_key_changes_with_any_component(self, changed) -> None:
+        """Test that every request component contributes to the key."""
+        baseline = make_cache_key("openai/gpt-4", "Be terse.", 0.0, 1.0, "Hi")
+
+        assert make_cache_key(*changed) != baseline
+
+
+class TestResponseStore:
+    """Test suite for storing and retrieving cached responses."""
+
+    def test_miss_returns_none(self) -> None:
+        """Test that unknown keys are cache misses."""
+        assert get_cached_response("missing") is None
+
+    def test_round_trip_returns_copy_of_usage(self) -> None:
+        """Test that cached usage cannot be mutated through a returned value."""
+        store_response("key", "text", {"total_tokens": 3})
+
+        text, usage = get_cached_response("key")
+        usage["total_tokens"] = 99
+
+        assert text == "text"
+        assert get_cached_response("key") == ("text", {"total_tokens": 3})
+
+    def test_least_recently_used_entry_is_evicted(self, monkeypatch) -> None:
+        """Test that the cache stays bounded and evicts the oldest entry."""
+        monkeypatch.setattr(agents.cache, "RESPONSE_CACHE_MAX_ENTRIES", 2)
+
+        store_response("a", "A", {})
+        store_response("b", "B", {})
+        get_cached_response("a")
+        store_response("c", "C", {})
+
+        assert get_cached_response("b") is None
+        assert get_cached_response("a") == ("A", {})
+        assert get_cached_response("c") == ("C", {})
@@ -442,4 +442,55 @@ class TestGetPricing:
 
         pricing = get_pricing("no_price/model")
 
-        assert pricing is None
\ No newline at end of file
+        assert pricing is None
+
+class TestSharedModelFetch:
+    """Test concurrent refreshes share a single OpenRouter fetch."""
+
+    def test_concurrent_refreshes_share_one_fetch(self, mocker) -> None:
+        """Test callers arriving during a fetch receive its result instead of fetching again."""
+        import threading
+        import time
+        import services.catalog
+
+        started = threading.Event()
+        release = threading.Event()
+        result = (list(FALLBACK_MODELS), "fallback", datetime(2025, 1, 1, tzinfo=timezone.utc))
+
+        def slow_fetch():
+            started.set()
+            release.wait(timeout=5)
+            return result
+
+        fetch = mocker.patch.object(services.catalog, "fetch_models", side_effect=slow_fetch)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(get_models(force_refresh=True)))
+        leader.start()
+        assert started.wait(timeout=5)
+
+        followers = [
+            threading.Thread(target=lambda: results.append(get_models(force_refresh=True)))
+            for _ in range(3)
+        ]
+        for follower in followers:
+            follower.start()
+        time.sleep(0.1)  # let followers find the in-flight fetch before it completes
+        release.set()
+        for thread in [leader, *followers]:
+            thread.join(timeout=5)
+
+        fetch.assert_called_once_with()
+        assert results == [result] * 4
+        assert services.catalog._fetch_in_flight is None
+
+    def test_fetch_after_completion_starts_a_new_request(self, mocker) -> None:
+        """Test a refresh after the previous one finished fetches again."""
+        import services.catalog
+
+        result = (list(FALLBACK_MODELS), "fallback", datetime(2025, 1, 1, tzinfo=timezone.utc))
+        fetch = mocker.patch.object(services.catalog, "fetch_models", return_value=result)
+
+        get_models(force_refresh=True)
+        get_models(force_refresh=True)
+
+        assert fetch.call_count == 2
@@ -55,6 +55,18 @@ class TestLoadingStateManager:
         assert updates["error_message"] == "Operation failed"
         assert "test_op" not in manager.active_operations
 
+    @pytest.mark.asyncio
+    async def test_complete_loading_reports_monotonic_duration(self, mocker, capsys):
+        """Test the logged duration comes from the monotonic clock."""
+        clock = mocker.patch("src.components.loading_states.time")
+        clock.monotonic.side_effect = [100.0, 102.5]
+        manager = LoadingStateManager()
+        await manager.start_loading("test_op", "session_save", "Saving...")
+
+        await manager.complete_loading("test_op")
+
+        assert "Operation test_op completed in 2.50s" in capsys.readouterr().out
+
     @pytest.mark.asyncio
     async def test_complete_nonexistent_operation(self):
         """Test completing a non-existent operation."""
@@ -95,6 +107,14 @@ class TestLoadingStateManager:
         disabled = manager._get_buttons_to_disable("unknown_op")
         assert disabled == []
 
+    def test_get_buttons_to_disable_returns_fresh_list(self):
+        """Test mutating a returned button list doesn't affect later calls."""
+        manager = LoadingStateManager()
+
+        manager._get_buttons_to_disable("message_send").append("extra-btn")
+
+        assert manager._get_buttons_to_disable("message_send") == ["send-btn", "stop-btn"]
+
 
 class TestRenderFunctions:
     """Test rendering functions."""
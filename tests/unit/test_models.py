@@ -86,6 +86,14 @@ class TestAgentConfig:
         )
         assert config.extras == custom_obj
 
+    def test_agent_config_web_tool_enabled_follows_tools(self) -> None:
+        """Test web_tool_enabled tracks the tools list, including on copies."""
+        config = AgentConfig(name="test", model="test", system_prompt="test", tools=["web_fetch"])
+
+        assert config.web_tool_enabled is True
+        assert config.model_copy(update={"tools": []}).web_tool_enabled is False
+        assert "web_tool_enabled" not in config.model_dump()
+
 
 class TestRunRecord:
     """Test suite for RunRecord model."""
@@ -334,4 +342,4 @@ class TestModelSerialization:
         # Test roundtrip
         session2 = Session(**data)
         assert session2.id == session.id
-        assert session2.notes == session.notes
\ No newline at end of file
+        assert session2.notes == session.notes
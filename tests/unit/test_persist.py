@@ -6,11 +6,16 @@ from pathlib import Path
 from hypothesis import given, strategies as st
 from typing import Any
 
-from agents.models import RunRecord
+from agents.models import AgentConfig, RunRecord, Session
+from services import persist
 from services.persist import (
     init_csv,
     append_run,
+    append_runs,
     load_recent_runs,
+    list_sessions,
+    load_session,
+    save_session,
     _coerce_bool,
     _coerce_int,
     _coerce_float,
@@ -108,6 +113,28 @@ class TestPersist:
         # Should contain ISO formatted timestamp
         assert "2023-01-01T12:00:00" in content
 
+    def test_append_runs_writes_batch_in_order(self, tmp_path: Path, mocker) -> None:
+        """Test append_runs writes one row per record, in order, under a single header."""
+        csv_file = tmp_path / "test_runs.csv"
+        mocker.patch('services.persist.CSV_PATH', csv_file)
+        records = [
+            RunRecord(
+                ts=datetime(2023, 1, 1, 12, 0, second),
+                agent_name=f"agent_{second}",
+                model="openai/gpt-4",
+                latency_ms=10,
+                streaming=False,
+                model_list_source="fallback",
+            )
+            for second in range(3)
+        ]
+
+        append_runs(records)
+        append_runs([])
+
+        assert [run.agent_name for run in load_recent_runs(limit=10)] == ["agent_0", "agent_1", "agent_2"]
+        assert csv_file.read_text(encoding="utf-8").count("ts,agent_name") == 1
+
     def test_load_recent_runs_roundtrip(self, tmp_path: Path) -> None:
         """Test load_recent_runs can read back what was written."""
         csv_file = tmp_path / "test_runs.csv"
@@ -141,6 +168,34 @@ class TestPersist:
         assert loaded_record.model == original_record.model
         assert loaded_record.prompt_tokens == original_record.prompt_tokens
 
+    def test_load_recent_runs_roundtrip_preserves_all_fields(self, tmp_path: Path, mocker) -> None:
+        """Test rows loaded without re-validation still match the written record exactly."""
+        csv_file = tmp_path / "test_runs.csv"
+        original_record = RunRecord(
+            ts=datetime(2023, 1, 1, 12, 0, 0),
+            agent_name="test_agent",
+            model="openai/gpt-4",
+            prompt_tokens=100,
+            completion_tokens=200,
+            total_tokens=300,
+            latency_ms=1500,
+            cost_usd=0.02,
+            experiment_id="exp-1",
+            task_label="qa",
+            run_notes="notes",
+            streaming=False,
+            model_list_source="dynamic",
+            tool_web_enabled=True,
+            web_status="blocked",
+            aborted=True,
+        )
+        mocker.patch('services.persist.CSV_PATH', csv_file)
+
+        append_run(original_record)
+        result = load_recent_runs(limit=1)
+
+        assert result[0].model_dump() == original_record.model_dump()
+
     def test_load_recent_runs_skips_malformed_rows(self, tmp_path: Path) -> None:
         """Test load_recent_runs skips malformed rows gracefully."""
         # This test should fail initially since the code doesn't handle malformed rows yet
@@ -276,4 +331,78 @@ class TestPersist:
             if stripped in {"1", "true", "yes", "y"}:
                 assert _coerce_bool(value) == True
             else:
-                assert _coerce_bool(value) == False
\ No newline at end of file
+                assert _coerce_bool(value) == False
+
+    def test_save_session_roundtrip(self, tmp_path: Path, mocker) -> None:
+        """Test a saved session loads back unchanged."""
+        mocker.patch('services.persist.SESSIONS_DIR', tmp_path)
+        session = Session(
+            id="abc123",
+            created_at=datetime(2023, 1, 1, 12, 0, 0),
+            agent_config=AgentConfig(name="agent", model="openai/gpt-4", system_prompt="Be brief."),
+            transcript=[{"role": "user", "content": "Hi"}, {"role": "assistant", "content": "Hello"}],
+            model_id="openai/gpt-4",
+            notes="demo",
+        )
+
+        path = save_session(session)
+
+        assert path == tmp_path / "abc123.json"
+        assert load_session(path) == session
+
+    def test_load_session_invalid_json(self, tmp_path: Path) -> None:
+        """Test a malformed session file is reported as invalid JSON."""
+        path = tmp_path / "broken.json"
+        path.write_text("{not json", encoding="utf-8")
+
+        with pytest.raises(RuntimeError, match="Invalid JSON in session file"):
+            load_session(path)
+
+    def test_load_session_parses_timestamps(self, tmp_path: Path) -> None:
+        """Test ISO timestamps in a session file load as datetimes."""
+        path = tmp_path / "abc123.json"
+        path.write_text(
+            '{"id": "abc123", "created_at": "2023-01-01T12:00:00+00:00", "model_id": "openai/gpt-4",'
+            ' "agent_config": {"name": "agent", "model": "openai/gpt-4", "system_prompt": "Be brief."},'
+            ' "transcript": [], "notes": "demo"}',
+            encoding="utf-8",
+        )
+
+        session = load_session(str(path))
+
+        assert session.created_at == datetime.fromisoformat("2023-01-01T12:00:00+00:00")
+        assert session.notes == "demo"
+
+    def _session(self, session_id: str, notes: str, day: int) -> Session:
+        return Session(
+            id=session_id,
+            created_at=datetime(2023, 1, day, 12, 0, 0),
+            agent_config=AgentConfig(name="agent", model="openai/gpt-4", system_prompt="Be brief."),
+            transcript=[],
+            model_id="openai/gpt-4",
+            notes=notes,
+        )
+
+    def test_list_sessions_parses_each_file_once(self, tmp_path: Path, mocker) -> None:
+        """Test unchanged session files are listed newest first without being parsed again."""
+        mocker.patch('services.persist.SESSIONS_DIR', tmp_path)
+        save_session(self._session("old", "first", 1))
+        save_session(self._session("new", "second", 2))
+        load = mocker.spy(persist, "load_session")
+
+        assert list_sessions() == [("second", tmp_path / "new.json"), ("first", tmp_path / "old.json")]
+        assert list_sessions() == [("second", tmp_path / "new.json"), ("first", tmp_path / "old.json")]
+        assert load.call_count == 2
+
+    def test_list_sessions_picks_up_rewritten_and_deleted_files(self, tmp_path: Path, mocker) -> None:
+        """Test a session re-saved under a new name is re-read and deleted files drop out."""
+        mocker.patch('services.persist.SESSIONS_DIR', tmp_path)
+        save_session(self._session("keep", "draft", 1))
+        gone = save_session(self._session("gone", "scratch", 2))
+        list_sessions()
+
+        save_session(self._session("keep", "final name", 1))
+        gone.unlink()
+
+        assert list_sessions() == [("final name", tmp_path / "keep.json")]
+
@@ -6,7 +6,8 @@ import asyncio
 from typing import Any
 from unittest.mock import Mock
 
-from agents.runtime import build_agent, run_agent, run_agent_stream, StreamResult
+import agents.runtime
+from agents.runtime import build_agent, get_agent, run_agent, run_agent_stream, StreamCancelEvent, StreamResult
 from agents.models import AgentConfig
 
 
@@ -198,6 +199,92 @@ class TestBuildAgent:
         with pytest.raises(TypeError, match="Invalid tool object"):
             build_agent(sample_agent_config)
 
+    def test_build_agent_reuses_openai_client(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test that repeated builds share one OpenAI client per base URL and key."""
+        mock_openai_class = mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+        mock_agent_class.return_value = mocker.Mock()
+
+        build_agent(sample_agent_config)
+        build_agent(sample_agent_config)
+
+        mock_openai_class.assert_called_once()
+        first_client = mock_agent_class.call_args_list[0].kwargs["openai_client"]
+        second_client = mock_agent_class.call_args_list[1].kwargs["openai_client"]
+        assert first_client is second_client
+
+
+    def test_get_agent_reuses_agent_for_identical_config(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test that unchanged configs share one agent and any change builds a new one."""
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+        mock_agent_class.side_effect = lambda *args, **kwargs: mocker.Mock()
+
+        first = get_agent(sample_agent_config)
+        again = get_agent(sample_agent_config.model_copy())
+        warmer = get_agent(sample_agent_config.model_copy(update={"temperature": 0.1}))
+        with_web = get_agent(sample_agent_config, include_web=True)
+
+        assert first is again
+        assert len({id(first), id(warmer), id(with_web)}) == 3
+        assert mock_agent_class.call_count == 3
+
+    def test_get_agent_ignores_fields_the_agent_does_not_use(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test renaming the agent or changing UI extras reuses the built agent."""
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent', side_effect=lambda *args, **kwargs: mocker.Mock())
+
+        first = get_agent(sample_agent_config)
+        renamed = get_agent(sample_agent_config.model_copy(update={"name": "Renamed", "extras": {"stream_coalesce_ms": 20}}))
+        reprompted = get_agent(sample_agent_config.model_copy(update={"system_prompt": "Answer in French."}))
+
+        assert renamed is first
+        assert reprompted is not first
+        assert mock_agent_class.call_count == 2
+
+    def test_get_agent_evicts_least_recently_used(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test that the agent cache stays bounded and evicts the stalest config."""
+        mocker.patch('agents.runtime.OpenAI')
+        mocker.patch('agents.runtime.Agent', side_effect=lambda *args, **kwargs: mocker.Mock())
+        mocker.patch('agents.runtime._AGENT_CACHE_SIZE', 2)
+        configs = [sample_agent_config.model_copy(update={"top_p": p}) for p in (0.1, 0.2, 0.3)]
+
+        first = get_agent(configs[0])
+        get_agent(configs[1])
+        assert get_agent(configs[0]) is first
+        get_agent(configs[2])
+
+        assert get_agent(configs[0]) is first
+        assert len(agents.runtime._AGENTS) == 2
+
+class TestOpenAIClientCache:
+    """Test suite for the shared OpenAI client cache."""
+
+    def test_repeated_key_reuses_client(self, mocker) -> None:
+        """Test builds with the same API key share one client."""
+        openai_cls = mocker.patch('agents.runtime.OpenAI')
+
+        first = agents.runtime._get_openai_client("https://example.test", "key")
+        second = agents.runtime._get_openai_client("https://example.test", "key")
+
+        assert first is second
+        openai_cls.assert_called_once_with(base_url="https://example.test", api_key="key")
+
+    def test_least_recently_used_client_is_evicted_and_closed(self, mocker) -> None:
+        """Test the cache stays bounded and closes the client it drops."""
+        mocker.patch('agents.runtime.OpenAI', side_effect=lambda **kwargs: mocker.Mock(**kwargs))
+        size = agents.runtime._OPENAI_CLIENT_CACHE_SIZE
+
+        clients = [agents.runtime._get_openai_client("https://example.test", f"key-{i}") for i in range(size)]
+        agents.runtime._get_openai_client("https://example.test", "key-0")  # refresh the oldest
+        agents.runtime._get_openai_client("https://example.test", "key-new")
+
+        assert len(agents.runtime._OPENAI_CLIENTS) == size
+        assert ("https://example.test", "key-0") in agents.runtime._OPENAI_CLIENTS
+        assert ("https://example.test", "key-1") not in agents.runtime._OPENAI_CLIENTS
+        clients[1].close.assert_called_once_with()
+        clients[0].close.assert_not_called()
+
 
 class TestRunAgent:
     """Test suite for run_agent function."""
@@ -333,6 +420,152 @@ class TestRunAgent:
         assert usage == {}
 
 
+    @pytest.mark.asyncio
+    async def test_run_agent_serves_deterministic_repeats_from_cache(self, mocker, mock_env_vars) -> None:
+        """Test that temperature-0 runs hit the response cache on repeat prompts."""
+        from agents.cache import clear_response_cache
+
+        clear_response_cache()
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        mock_result = mocker.Mock()
+        mock_result.data = "42"
+        mock_result.new_messages.return_value = []
+        mock_agent_instance.run = mocker.AsyncMock(return_value=mock_result)
+
+        cfg = AgentConfig(
+            name="deterministic",
+            model="openai/gpt-4-turbo",
+            system_prompt="Answer with a number.",
+            temperature=0.0,
+        )
+        agent = build_agent(cfg)
+
+        first = await run_agent(agent, "What is 6 x 7?", cfg)
+        second = await run_agent(agent, "What is 6 x 7?", cfg)
+        clear_response_cache()
+
+        assert first == second == ("42", {})
+        mock_agent_instance.run.assert_awaited_once_with("What is 6 x 7?")
+
+    @pytest.mark.asyncio
+    async def test_run_agent_does_not_cache_results_without_message_history(self, mocker, mock_env_vars) -> None:
+        """Test that a result without new_messages is treated as opaque and never cached."""
+        from types import SimpleNamespace
+        from agents.cache import clear_response_cache
+
+        clear_response_cache()
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+        mock_agent_instance.run = mocker.AsyncMock(return_value=SimpleNamespace(data="42"))
+
+        cfg = AgentConfig(
+            name="deterministic",
+            model="openai/gpt-4-turbo",
+            system_prompt="Answer with a number.",
+            temperature=0.0,
+        )
+        agent = build_agent(cfg)
+
+        await run_agent(agent, "What is 6 x 7?", cfg)
+        await run_agent(agent, "What is 6 x 7?", cfg)
+        clear_response_cache()
+
+        assert mock_agent_instance.run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_agent_cache_separates_web_tool_configs(self, mocker, mock_env_vars) -> None:
+        """Test that a cached answer from an agent without the web tool isn't served to one with it."""
+        from agents.cache import clear_response_cache
+
+        clear_response_cache()
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        mock_result = mocker.Mock()
+        mock_result.data = "I can't browse the web."
+        mock_result.new_messages.return_value = []
+        mock_agent_instance.run = mocker.AsyncMock(return_value=mock_result)
+
+        offline = AgentConfig(
+            name="deterministic",
+            model="openai/gpt-4-turbo",
+            system_prompt="Summarise the page.",
+            temperature=0.0,
+        )
+        online = offline.model_copy(update={"tools": ["web_fetch"]})
+        agent = build_agent(offline)
+
+        await run_agent(agent, "Summarise https://example.com", offline)
+        await run_agent(agent, "Summarise https://example.com", online)
+        clear_response_cache()
+
+        assert mock_agent_instance.run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_agent_skips_cache_for_sampled_configs(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test that non-zero temperature runs always call the model."""
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        mock_result = mocker.Mock()
+        mock_result.data = "Hello"
+        mock_result.new_messages.return_value = []
+        mock_agent_instance.run = mocker.AsyncMock(return_value=mock_result)
+
+        agent = build_agent(sample_agent_config)
+        await run_agent(agent, "Hi", sample_agent_config)
+        await run_agent(agent, "Hi", sample_agent_config)
+
+        assert mock_agent_instance.run.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_agent_normalized_cache_key_matches_rewordings(self, mocker, mock_env_vars) -> None:
+        """Test that opting into normalized keys serves trivially reworded prompts from cache."""
+        from agents.cache import clear_response_cache
+
+        clear_response_cache()
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        mock_result = mocker.Mock()
+        mock_result.data = "42"
+        mock_result.new_messages.return_value = []
+        mock_agent_instance.run = mocker.AsyncMock(return_value=mock_result)
+
+        cfg = AgentConfig(
+            name="deterministic",
+            model="openai/gpt-4-turbo",
+            system_prompt="Answer with a number.",
+            temperature=0.0,
+            extras={"normalize_cache_key": True},
+        )
+        agent = build_agent(cfg)
+
+        first = await run_agent(agent, "What is 6 x 7?", cfg)
+        second = await run_agent(agent, "  what IS 6   x 7 ", cfg)
+        clear_response_cache()
+
+        assert first == second == ("42", {})
+        mock_agent_instance.run.assert_awaited_once_with("What is 6 x 7?")
+
+
 class TestRunAgentStream:
     """Test suite for run_agent_stream function."""
 
@@ -421,6 +654,163 @@ class TestRunAgentStream:
         # Should have empty text since cancelled before any processing
         assert result.text == ""
 
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_without_collect_only_forwards_deltas(self, mocker) -> None:
+        """Test that collect=False forwards deltas but skips text accumulation."""
+        class MockChunk:
+            def __init__(self, delta):
+                self.delta = delta
+
+        async def mock_stream():
+            for delta in ["The", " quick", " brown"]:
+                yield MockChunk(delta)
+
+        agent = mocker.Mock()
+        agent.run.return_value = mock_stream()
+
+        collected_deltas = []
+        result = await run_agent_stream(
+            agent, "Test message", collected_deltas.append, Event(), collect=False
+        )
+
+        assert collected_deltas == ["The", " quick", " brown"]
+        assert result.text == ""
+        assert result.aborted is False
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_converts_usage_once_per_stream(self, mocker) -> None:
+        """Test that only the final chunk's usage is converted, not every chunk's."""
+        dumps = []
+
+        class Usage:
+            def __init__(self, tokens):
+                self.tokens = tokens
+
+            def model_dump(self):
+                dumps.append(self.tokens)
+                return {"total_tokens": self.tokens}
+
+        class MockChunk:
+            def __init__(self, delta, tokens):
+                self.delta = delta
+                self.response = mocker.Mock(usage=Usage(tokens))
+
+        async def mock_stream():
+            for tokens, delta in enumerate(["a", "b", "c"], start=1):
+                yield MockChunk(delta, tokens)
+
+        agent = mocker.Mock()
+        agent.run.return_value = mock_stream()
+
+        result = await run_agent_stream(agent, "Test message", lambda _: None, Event())
+
+        assert result.usage == {"total_tokens": 3}
+        assert dumps == [3]
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_asyncio_event_interrupts_stalled_stream(self, mocker) -> None:
+        """Test that an asyncio.Event cancels while the stream is waiting for data."""
+        class MockChunk:
+            def __init__(self, delta):
+                self.delta = delta
+
+        stream_closed = asyncio.Event()
+
+        async def stalled_stream():
+            try:
+                yield MockChunk("Hello")
+                await asyncio.sleep(3600)
+                yield MockChunk(" never")  # pragma: no cover
+            finally:
+                stream_closed.set()
+
+        agent = mocker.Mock()
+        agent.run.return_value = stalled_stream()
+        cancel_token = asyncio.Event()
+        deltas = []
+
+        def on_delta(delta: str) -> None:
+            deltas.append(delta)
+            asyncio.get_running_loop().call_later(0.01, cancel_token.set)
+
+        result = await asyncio.wait_for(
+            run_agent_stream(agent, "Test message", on_delta, cancel_token), timeout=5
+        )
+
+        assert result.aborted is True
+        assert result.text == "Hello"
+        assert deltas == ["Hello"]
+        assert stream_closed.is_set()
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_real_pydantic_ai_agent(self) -> None:
+        """Test streaming a real (unhashable) pydantic-ai Agent and forgetting it once freed."""
+        import gc
+        from pydantic_ai import Agent
+
+        agent = Agent("test")
+        deltas = []
+
+        result = await run_agent_stream(agent, "Test message", deltas.append, Event())
+        again = await run_agent_stream(agent, "Test message", deltas.append, Event())
+
+        assert result.text == again.text == "success (no tool calls)"
+        assert result.aborted is False
+        assert result.usage["output_tokens"] > 0
+        key = id(agent)
+        assert agents.runtime._STREAM_KIND[key] == "ctx"
+
+        del agent
+        gc.collect()
+        assert key not in agents.runtime._STREAM_KIND
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_stream_cancel_event_set_from_thread(self, mocker) -> None:
+        """Test a StreamCancelEvent set on another thread interrupts a stalled stream."""
+        class MockChunk:
+            def __init__(self, delta):
+                self.delta = delta
+
+        async def stalled_stream():
+            yield MockChunk("Hello")
+            await asyncio.sleep(3600)
+            yield MockChunk(" never")  # pragma: no cover
+
+        agent = mocker.Mock()
+        agent.run.return_value = stalled_stream()
+        cancel_token = StreamCancelEvent()
+
+        def on_delta(delta: str) -> None:
+            asyncio.get_running_loop().run_in_executor(None, cancel_token.set)
+
+        result = await asyncio.wait_for(
+            run_agent_stream(agent, "Test message", on_delta, cancel_token), timeout=5
+        )
+
+        assert result.aborted is True
+        assert result.text == "Hello"
+        assert cancel_token.is_set()
+        assert cancel_token.async_event.is_set()
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_asyncio_event_completes_without_cancel(self, mocker) -> None:
+        """Test that an unset asyncio.Event lets the stream run to completion."""
+        class MockChunk:
+            def __init__(self, delta):
+                self.delta = delta
+
+        async def mock_stream():
+            for delta in ["a", "b", "c"]:
+                yield MockChunk(delta)
+
+        agent = mocker.Mock()
+        agent.run.return_value = mock_stream()
+
+        result = await run_agent_stream(agent, "Test message", lambda _: None, asyncio.Event())
+
+        assert result.text == "abc"
+        assert result.aborted is False
+
     @pytest.mark.asyncio
     async def test_run_agent_stream_aggregates_deltas(self, mocker, mock_env_vars, sample_agent_config) -> None:
         """Test that streaming correctly aggregates text from deltas."""
@@ -664,6 +1054,75 @@ class TestRunAgentStream:
         assert result.text == "First"
         assert deltas == ["First"]
 
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_remembers_run_stream_agents(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test agents without ``run(stream=True)`` are probed only on their first stream."""
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+        mock_agent_instance.run.side_effect = TypeError("unexpected keyword argument 'stream'")
+
+        mock_stream_ctx = mocker.AsyncMock()
+        mock_stream_response = mocker.Mock()
+
+        async def stream_text(delta: bool = True):
+            yield "Hi"
+
+        mock_stream_response.stream_text.side_effect = stream_text
+        mock_stream_response.usage.return_value = {"tokens": 1}
+        mock_agent_instance.run_stream.return_value = mock_stream_ctx
+        mock_stream_ctx.__aenter__.return_value = mock_stream_response
+        mock_stream_ctx.__aexit__.return_value = None
+
+        agent = build_agent(sample_agent_config)
+
+        first = await run_agent_stream(agent, "One", lambda _: None, Event())
+        second = await run_agent_stream(agent, "Two", lambda _: None, Event())
+
+        assert first.text == second.text == "Hi"
+        assert mock_agent_instance.run.call_count == 1
+        assert mock_agent_instance.run_stream.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_coalesces_deltas(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test coalescing batches deltas by size and flushes the remainder at stream end."""
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        async def mock_stream():
+            for token in ["ab", "cd", "ef", "g"]:
+                yield mocker.Mock(delta=token, response=None)
+
+        mock_agent_instance.run.return_value = mock_stream()
+        agent = build_agent(sample_agent_config)
+        deltas: list[str] = []
+
+        result = await run_agent_stream(
+            agent, "Test message", deltas.append, Event(), coalesce_ms=1000, coalesce_chars=4
+        )
+
+        assert deltas == ["abcd", "efg"]
+        assert result.text == "abcdefg"
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_coalescer_flushes_on_window(self) -> None:
+        """Test buffered deltas are forwarded once the coalescing window elapses."""
+        from agents.runtime import _DeltaCoalescer
+
+        deltas: list[str] = []
+        coalescer = _DeltaCoalescer(deltas.append, asyncio.get_running_loop(), 0.01, 256)
+
+        coalescer("a")
+        coalescer("b")
+        assert deltas == []
+
+        await asyncio.sleep(0.05)
+        assert deltas == ["ab"]
+
     @pytest.mark.asyncio
     async def test_run_agent_stream_correlation_id_logging(self, mocker, mock_env_vars, sample_agent_config) -> None:
         """Test that correlation ID is properly bound to logger."""
@@ -696,6 +1155,58 @@ class TestRunAgentStream:
         assert result.aborted is False
         assert result.text == ""
 
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_skips_chunks_without_delta(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test chunks lacking a ``delta`` attribute still contribute usage without emitting text."""
+        from types import SimpleNamespace
+
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        async def mock_stream():
+            yield SimpleNamespace(delta="Hello")
+            yield SimpleNamespace(response=SimpleNamespace(usage={"total_tokens": 3}))
+
+        mock_agent_instance.run.return_value = mock_stream()
+        agent = build_agent(sample_agent_config)
+        deltas: list[str] = []
+
+        result = await run_agent_stream(agent, "Test message", deltas.append, Event())
+
+        assert deltas == ["Hello"]
+        assert result.text == "Hello"
+        assert result.usage == {"total_tokens": 3}
+
+    @pytest.mark.asyncio
+    async def test_run_agent_stream_logs_structured_fields(self, mocker, mock_env_vars, sample_agent_config) -> None:
+        """Test streaming log fields are bound directly onto the record's extra dict."""
+        from loguru import logger
+
+        mocker.patch('agents.runtime.OpenAI')
+        mock_agent_class = mocker.patch('agents.runtime.Agent')
+        mock_agent_instance = mocker.Mock()
+        mock_agent_class.return_value = mock_agent_instance
+
+        async def mock_stream():
+            yield mocker.Mock(delta="Hi", response=None)
+
+        mock_agent_instance.run.return_value = mock_stream()
+        agent = build_agent(sample_agent_config)
+
+        records: list[dict[str, Any]] = []
+        sink_id = logger.add(lambda message: records.append(message.record), level="INFO")
+        try:
+            await run_agent_stream(agent, "Test message", lambda _: None, Event(), correlation_id="test-123")
+        finally:
+            logger.remove(sink_id)
+
+        completed = next(r for r in records if r["message"] == "Agent streaming completed")
+        assert completed["extra"]["correlation_id"] == "test-123"
+        assert completed["extra"]["response_length"] == 2
+        assert completed["extra"]["aborted"] is False
+
     @pytest.mark.asyncio
     async def test_run_agent_stream_handles_async_stream_iterable(self, mocker, mock_env_vars, sample_agent_config) -> None:
         """Test streaming handles async stream iterable from agent.run()."""
@@ -791,4 +1302,12 @@ class TestStreamResult:
         assert result.aborted is False
         assert result.usage is None
         assert result.text == "test"
-        assert result.latency_ms == 100
\ No newline at end of file
+        assert result.latency_ms == 100
+
+    def test_stream_result_uses_slots(self) -> None:
+        """Test StreamResult stores fields in slots and stays mutable."""
+        result = StreamResult(text="test", usage=None, latency_ms=100)
+
+        assert not hasattr(result, "__dict__")
+        result.aborted = True
+        assert result.aborted is True